@@ -0,0 +1,205 @@
+"""
+오프라인 벤치마크: 스크래핑/파싱 핫패스와 파이프라인의 처리량·지연시간 측정
+
+- 네트워크 없이 fixtures/ 의 네이버 HTML, Google 뉴스 RSS를 로컬 어댑터로 재생합니다.
+  (공유 Fetcher 세션에 requests 어댑터를 마운트하므로 커넥션 풀/레이트리밋/재시도 경로도 그대로 거칩니다)
+- 가격 패널과 수급 데이터는 고정 시드로 합성해 종목/섹터 수를 늘려가며 측정합니다.
+- 네트워크가 되는 환경에서 `python benchmark.py --record` 로 fixtures를 실제 페이지로 갱신할 수 있습니다.
+
+사용법:
+    python benchmark.py                       # 기본 규모 (250종목 / 20섹터)
+    python benchmark.py --scale full          # 250 -> 2,500종목, 20 -> 200섹터
+    python benchmark.py --latency 30 --json bench.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import BaseAdapter
+
+import http_fetcher
+from http_fetcher import Fetcher
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+FIXTURES = {
+    "frgn.naver": ("naver_frgn.html", "https://finance.naver.com/item/frgn.naver?code=005930"),
+    "main.naver": ("naver_main.html", "https://finance.naver.com/item/main.naver?code=005930"),
+    "sise_market_sum.naver": ("naver_sise_market_sum.html", "https://finance.naver.com/sise/sise_market_sum.naver?&page=1"),
+    "news.google.com/rss": ("google_news_rss.xml", "https://news.google.com/rss/search?q=%EB%B0%98%EB%8F%84%EC%B2%B4%20%EC%A3%BC%EC%8B%9D%20%EB%89%B4%EC%8A%A4&hl=ko&gl=KR&ceid=KR:ko"),
+}
+FIXTURE_NEWS_DATE = "06 Feb 2026"
+SCALES = {"small": {"tickers": [250], "sectors": [20]}, "full": {"tickers": [250, 1000, 2500], "sectors": [20, 60, 200]}}
+
+class FixtureAdapter(BaseAdapter):
+    """
+    URL 패턴별로 fixtures 파일을 응답하는 requests 어댑터 (latency_ms 만큼 지연 추가)
+    """
+    def __init__(self, latency_ms=0):
+        super().__init__()
+        self.latency = latency_ms / 1000
+        self.bodies = {}
+        for pattern, (filename, _) in FIXTURES.items():
+            with open(os.path.join(FIXTURE_DIR, filename), "rb") as f:
+                self.bodies[pattern] = f.read()
+
+    def send(self, request, **kwargs):
+        if self.latency: time.sleep(self.latency)
+        res = requests.Response()
+        res.url, res.request = request.url, request
+        body = next((b for pattern, b in self.bodies.items() if pattern in request.url), None)
+        res.status_code = 200 if body is not None else 404
+        res._content = body or b""
+        res.headers["Content-Length"] = str(len(res._content))
+        return res
+
+    def close(self):
+        pass
+
+def install_fixture_fetcher(workers, rps, latency_ms):
+    fetcher = Fetcher(max_workers=workers, rate_per_host=rps, retries=0)
+    adapter = FixtureAdapter(latency_ms)
+    fetcher.session.mount("https://", adapter)
+    fetcher.session.mount("http://", adapter)
+    http_fetcher._default_fetcher = fetcher
+    return fetcher
+
+def record_fixtures():
+    """
+    실제 사이트에서 fixtures를 다시 받아 저장합니다. (네트워크 필요)
+    """
+    fetcher = Fetcher()
+    for filename, url in FIXTURES.values():
+        res = fetcher.get(url)
+        res.raise_for_status()
+        with open(os.path.join(FIXTURE_DIR, filename), "wb") as f:
+            f.write(res.content)
+        print(f"recorded {filename} ({len(res.content):,} bytes)")
+
+def measure(fn, repeat):
+    """
+    fn을 repeat번 호출해 호출당 지연시간(초) 목록을 반환합니다.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+def summarize(name, times, items=1):
+    mean = statistics.fmean(times)
+    ordered = sorted(times)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return {"name": name, "runs": len(times), "items": items, "mean_ms": round(mean * 1000, 3),
+            "p50_ms": round(statistics.median(times) * 1000, 3), "p95_ms": round(p95 * 1000, 3),
+            "items_per_s": round(items / mean, 1) if mean > 0 else None}
+
+def synthetic_universe(n_tickers, n_sectors, n_days=60, sector_size=10, seed=0):
+    """
+    합성 가격 패널 (yf.download 형식의 (가격항목, 티커) 멀티컬럼), 수급 데이터, 섹터 구성
+    """
+    rng = np.random.default_rng(seed)
+    tickers = [f"{i:06d}.KS" for i in range(n_tickers)]
+    dates = pd.bdate_range(end="2026-02-06", periods=n_days, name="Date")
+    close = 10000 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_days, n_tickers)), axis=0))
+    volume = rng.integers(10_000, 5_000_000, (n_days, n_tickers)).astype(float)
+    fields = {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": volume}
+    panel = pd.concat({f: pd.DataFrame(v, index=dates, columns=tickers) for f, v in fields.items()}, axis=1)
+    date_str = dates.strftime("%Y%m%d")
+    naver_dfs = {}
+    for j, t in enumerate(tickers):
+        inst, frn = rng.integers(-100_000, 100_000, (2, 20))
+        naver_dfs[t] = pd.DataFrame({"날짜": date_str[-20:], "거래량": volume[-20:, j].astype(int), "기관": inst, "외국인": frn, "개인": -(inst + frn)})
+    sectors = {f"섹터{s}": list(rng.choice(tickers, sector_size, replace=False)) for s in range(n_sectors)}
+    return panel, naver_dfs, sectors
+
+def load_fixture(key):
+    with open(os.path.join(FIXTURE_DIR, FIXTURES[key][0]), "rb") as f:
+        return f.read()
+
+def bench_parsers(repeat):
+    """
+    parser:* 는 fixtures 원문 바이트에 대한 파싱만, fetch+parse:* 는 Fetcher(레이트리밋/어댑터) 경유 전체 경로를 측정합니다.
+    """
+    import stock_report
+    import per_screener
+    from naver_parse import parse_investor_table, parse_market_sum, parse_financial_summary, split_summary
+    from sector_news import parse_rss_items, dedup_news
+    frgn, market_sum, main = load_fixture("frgn.naver"), load_fixture("sise_market_sum.naver"), load_fixture("main.naver")
+    rss = load_fixture("news.google.com/rss")
+    return [
+        summarize("parser:parse_investor_table", measure(lambda: parse_investor_table(frgn), repeat)),
+        summarize("parser:parse_market_sum", measure(lambda: parse_market_sum(market_sum), repeat)),
+        summarize("parser:parse_financial_summary+split_summary", measure(lambda: split_summary(parse_financial_summary(main)), repeat)),
+        summarize("parser:parse_rss_items+dedup_news", measure(lambda: dedup_news(parse_rss_items(rss, FIXTURE_NEWS_DATE)), repeat)),
+        summarize("fetch+parse:get_naver_investor_data", measure(lambda: stock_report.get_naver_investor_data("005930.KS"), repeat)),
+        summarize("fetch+parse:get_naver_market_sum", measure(lambda: per_screener.get_naver_market_sum(1), repeat)),
+        summarize("fetch+parse:get_last_4q_op_sum", measure(lambda: per_screener.get_last_4q_op_sum("005930"), repeat)),
+    ]
+
+def bench_metrics(scale, repeat):
+    from sector_metrics import compute_sector_metrics
+    results = []
+    for n_tickers in SCALES[scale]["tickers"]:
+        for n_sectors in SCALES[scale]["sectors"]:
+            panel, naver_dfs, sectors = synthetic_universe(n_tickers, n_sectors)
+            times = measure(lambda: compute_sector_metrics(panel, naver_dfs, sectors), repeat)
+            results.append(summarize(f"metrics:compute_sector_metrics[{n_tickers}t/{n_sectors}s]", times, n_sectors))
+    return results
+
+def bench_pipelines(scale, fetcher):
+    import stock_report
+    import per_screener
+    from sector_news import FeedCache, get_all_sector_news
+    results = []
+    for n_tickers in SCALES[scale]["tickers"]:
+        tickers = [f"{i:06d}.KS" for i in range(n_tickers)]
+        stock_report.clear_investor_cache()
+        times = measure(lambda: stock_report.fetch_investor_data(tickers), 1)
+        results.append(summarize(f"pipeline:fetch_investor_data[{n_tickers}t]", times, n_tickers))
+        codes = [t.split('.')[0] for t in tickers]
+        times = measure(lambda: per_screener.crawl_op_sums(codes, fetcher, progress=False), 1)
+        results.append(summarize(f"pipeline:crawl_op_sums[{n_tickers}t]", times, n_tickers))
+    for n_sectors in SCALES[scale]["sectors"]:
+        sectors = {f"섹터{s}": [f"{s:06d}.KS"] for s in range(n_sectors)}
+        with tempfile.TemporaryDirectory() as tmp:
+            times = measure(lambda: get_all_sector_news(sectors, cache=FeedCache(tmp, ttl_seconds=0), allowed_date=FIXTURE_NEWS_DATE), 1)
+        results.append(summarize(f"pipeline:get_all_sector_news[{n_sectors}s]", times, n_sectors))
+    return results
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="오프라인 파서/파이프라인 벤치마크")
+    parser.add_argument('--scale', choices=SCALES, default="small", help="합성 종목/섹터 규모")
+    parser.add_argument('--repeat', type=int, default=20, help="파서/지표 측정 반복 횟수")
+    parser.add_argument('--workers', type=int, default=8, help="파이프라인 동시 워커 수")
+    parser.add_argument('--rps', type=float, default=1000, help="호스트별 초당 최대 요청 수")
+    parser.add_argument('--latency', type=float, default=0, help="재생 응답마다 추가할 지연(ms)")
+    parser.add_argument('--only', choices=["parsers", "metrics", "pipelines"], help="일부 벤치마크만 실행")
+    parser.add_argument('--json', help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument('--record', action='store_true', help="실제 사이트에서 fixtures를 다시 받아 저장")
+    return parser.parse_args()
+
+def main(args=None):
+    args = args or parse_args()
+    if args.record:
+        record_fixtures(); return
+    fetcher = install_fixture_fetcher(args.workers, args.rps, args.latency)
+    results = []
+    if args.only in (None, "parsers"): results += bench_parsers(args.repeat)
+    if args.only in (None, "metrics"): results += bench_metrics(args.scale, args.repeat)
+    if args.only in (None, "pipelines"): results += bench_pipelines(args.scale, fetcher)
+    print(pd.DataFrame(results).to_markdown(index=False))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "python": sys.version.split()[0], "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.json}")
+
+if __name__ == "__main__":
+    main()
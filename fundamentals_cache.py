@@ -0,0 +1,103 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from run_stats import get_run_stats
+
+DEFAULT_PATH = os.path.join("cache", "fundamentals.sqlite")
+SCHEMA_VERSION = 3
+
+# 국내 실적 발표 시즌 (월, 일) 구간: 연간(4Q) / 1Q / 2Q / 3Q
+EARNINGS_SEASONS = [((1, 15), (3, 31)), ((4, 15), (5, 20)), ((7, 15), (8, 20)), ((10, 15), (11, 20))]
+
+def in_earnings_season(dt):
+    md = (dt.month, dt.day)
+    return any(start <= md <= end for start, end in EARNINGS_SEASONS)
+
+def last_season_boundary(dt):
+    """
+    dt 이전(포함) 가장 최근의 실적 시즌 시작/종료 시점
+    """
+    boundaries = []
+    for year in (dt.year - 1, dt.year):
+        for start, end in EARNINGS_SEASONS:
+            boundaries.append(datetime(year, *start))
+            boundaries.append(datetime(year, *end))
+    return max(b for b in boundaries if b <= dt)
+
+class FundamentalsCache:
+    """
+    종목/항목/기간별 실적 데이터 로컬 캐시 (SQLite)
+    - kind: 'Q'(분기) / 'Y'(연간), 한 종목의 데이터는 같은 시점에 함께 수집/교체
+    - 평소에는 ttl_days, 실적 시즌 중에는 season_ttl_days 동안 유효
+    - 실적 시즌 시작/종료 경계 이전에 받은 데이터는 만료 처리
+    - 재무정보 표가 없던 종목(빈 결과)은 negative_ttl_hours 동안만 유효
+    - max_tickers를 넘으면 가장 오래 조회되지 않은 종목부터 삭제 (LRU)
+    """
+    def __init__(self, path=DEFAULT_PATH, max_tickers=5000, ttl_days=30, season_ttl_days=1, negative_ttl_hours=6):
+        self.path = path
+        self.max_tickers = max_tickers
+        self.ttl = ttl_days * 86400
+        self.season_ttl = season_ttl_days * 86400
+        self.negative_ttl = negative_ttl_hours * 3600
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            if self.conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                self.conn.execute("DROP TABLE IF EXISTS fundamentals")
+                self.conn.execute("DROP TABLE IF EXISTS fetch_log")
+                self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS fundamentals (ticker TEXT, kind TEXT, item TEXT, period TEXT, seq INTEGER, value REAL, PRIMARY KEY (ticker, kind, item, period))")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS fetch_log (ticker TEXT PRIMARY KEY, fetched_at REAL, last_access REAL, empty INTEGER)")
+
+    def is_fresh(self, fetched_at, now=None, empty=False):
+        now = now or time.time()
+        if empty: return now - fetched_at <= self.negative_ttl
+        now_dt = datetime.fromtimestamp(now)
+        ttl = self.season_ttl if in_earnings_season(now_dt) else self.ttl
+        if now - fetched_at > ttl: return False
+        return fetched_at >= last_season_boundary(now_dt).timestamp()
+
+    def get_items(self, ticker):
+        """
+        신선한 캐시가 있으면 {'Q': {항목: [(기간, 값), ...]}, 'Y': {...}}를, 없거나 만료되었으면 None을 반환합니다.
+        """
+        now = time.time()
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT fetched_at, empty FROM fetch_log WHERE ticker = ?", (ticker,)).fetchone()
+            fresh = row is not None and self.is_fresh(row[0], now, bool(row[1]))
+            get_run_stats().record_cache("fundamentals", fresh)
+            if not fresh: return None
+            self.conn.execute("UPDATE fetch_log SET last_access = ? WHERE ticker = ?", (now, ticker))
+            rows = self.conn.execute("SELECT kind, item, period, value FROM fundamentals WHERE ticker = ? ORDER BY kind, item, seq", (ticker,)).fetchall()
+        items = {'Q': {}, 'Y': {}}
+        for kind, item, period, value in rows:
+            items.setdefault(kind, {}).setdefault(item, []).append((period, value))
+        return items
+
+    def put_items(self, ticker, items):
+        """
+        종목의 실적 데이터 {'Q': {항목: [(기간, 값), ...]}, 'Y': {...}}를 저장 (기존 데이터는 모두 교체)
+        값이 하나도 없으면 빈 결과로 표시해 negative_ttl 동안만 캐시합니다.
+        """
+        now = time.time()
+        rows = [(ticker, kind, item, p, i, v) for kind, by_item in items.items() for item, values in by_item.items() for i, (p, v) in enumerate(values)]
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM fundamentals WHERE ticker = ?", (ticker,))
+            self.conn.executemany("INSERT INTO fundamentals VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.conn.execute("INSERT OR REPLACE INTO fetch_log VALUES (?, ?, ?, ?)", (ticker, now, now, int(not rows)))
+
+    def evict(self):
+        with self.lock, self.conn:
+            stale = self.conn.execute("SELECT ticker FROM fetch_log ORDER BY last_access DESC LIMIT -1 OFFSET ?", (self.max_tickers,)).fetchall()
+            for (ticker,) in stale:
+                self.conn.execute("DELETE FROM fundamentals WHERE ticker = ?", (ticker,))
+                self.conn.execute("DELETE FROM fetch_log WHERE ticker = ?", (ticker,))
+        return len(stale)
+
+    def close(self):
+        self.evict()
+        self.conn.close()
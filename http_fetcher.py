@@ -0,0 +1,112 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from run_stats import get_run_stats
+
+DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0'}
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+class RateLimiter:
+    """
+    토큰 버킷 방식의 초당 요청 수 제한 (여러 스레드에서 공유)
+    """
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class Fetcher:
+    """
+    keep-alive 커넥션 풀을 공유하는 HTTP 수집기
+    - 호스트별 초당 요청 수 제한
+    - 타임아웃 및 지수 백오프 재시도
+    - 스레드 풀 기반 동시 수집과 실행 단위 결과 메모이제이션
+    """
+    def __init__(self, max_workers=8, rate_per_host=10, timeout=10, retries=3, backoff=0.5):
+        self.max_workers = max_workers
+        self.rate_per_host = rate_per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def _limiter(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._limiters:
+                self._limiters[host] = RateLimiter(self.rate_per_host)
+            return self._limiters[host]
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        stats = get_run_stats()
+        start = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            self._limiter(url).acquire()
+            try:
+                res = self.session.get(url, **kwargs)
+                if res.status_code in RETRY_STATUS:
+                    raise requests.HTTPError(f"HTTP {res.status_code}: {url}", response=res)
+                stats.record_request(url, time.perf_counter() - start, len(res.content), res.status_code, attempt, ok=res.ok)
+                return res
+            except requests.RequestException as e:
+                if attempt == self.retries:
+                    status = e.response.status_code if e.response is not None else None
+                    stats.record_request(url, time.perf_counter() - start, 0, status, attempt, ok=False)
+                    raise
+                time.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+
+    def fetch_all(self, func, keys, cache=None):
+        """
+        keys 각각에 대해 func(key)를 스레드 풀에서 실행하여 {key: 결과}를 반환합니다.
+        cache(dict)가 주어지면 이미 가져온 key는 건너뛰고 새 결과를 cache에 저장합니다.
+        """
+        memo_name = f"memo:{getattr(func, '__name__', 'fetch_all')}" if cache is not None else None
+        cache = {} if cache is None else cache
+        keys = list(dict.fromkeys(keys))
+        missing = [k for k in keys if k not in cache]
+        if memo_name:
+            get_run_stats().record_cache(memo_name, True, len(keys) - len(missing))
+            get_run_stats().record_cache(memo_name, False, len(missing))
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
+                for k, result in zip(missing, ex.map(func, missing)):
+                    cache[k] = result
+        return {k: cache[k] for k in keys}
+
+_default_fetcher = None
+
+def get_fetcher():
+    """
+    프로세스 전역에서 공유하는 기본 Fetcher
+    """
+    global _default_fetcher
+    if _default_fetcher is None:
+        _default_fetcher = Fetcher()
+    return _default_fetcher
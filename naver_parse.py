@@ -0,0 +1,140 @@
+import re
+
+import numpy as np
+from lxml import html
+
+CODE_RE = re.compile(r'code=(\d+)')
+
+def decode(content):
+    return content.decode('cp949', 'ignore') if isinstance(content, bytes) else content
+
+def _slice_table(text, marker):
+    """
+    marker를 포함한 <table>...</table> 구간만 잘라냅니다. (전체 페이지 DOM을 만들지 않기 위함)
+    찾지 못하면 None
+    """
+    i = text.find(marker)
+    if i < 0: return None
+    start = text.rfind('<table', 0, i)
+    end = text.find('</table>', i)
+    if start < 0 or end < 0: return None
+    return text[start:end + len('</table>')]
+
+def _find_table(text, marker, predicate):
+    """
+    marker가 들어있는 표만 잘라 파싱하고, 그 표가 predicate(XPath 조건)를 만족하지 않으면
+    전체 문서에서 //table[predicate]로 찾습니다.
+    """
+    fragment = _slice_table(text, marker)
+    if fragment is not None:
+        try:
+            table = html.fragment_fromstring(fragment)
+            if table.xpath(f"boolean(self::table[{predicate}])"): return table
+        except Exception:
+            pass
+    found = html.fromstring(text).xpath(f"//table[{predicate}]")
+    return found[0] if found else None
+
+def _cell_text(el):
+    return "".join(el.itertext()).strip()
+
+def to_number(text):
+    """
+    '1,234' / '+1,234' / '-12.5' -> float, 빈 값이나 '-', 'N/A'는 NaN
+    """
+    text = text.replace(',', '').replace('%', '').strip()
+    try: return float(text)
+    except ValueError: return np.nan
+
+def parse_investor_table(content):
+    """
+    종목별 외국인/기관 순매매(frgn.naver) 표에서 날짜별 거래량/기관/외국인 순매매량을 추출합니다.
+    반환값: {'날짜': str 배열('YYYYMMDD'), '거래량'/'기관'/'외국인': int64 배열}, 표가 없으면 None
+    """
+    table = _find_table(decode(content), '날짜', "contains(@class, 'type2') and .//th[contains(., '날짜')]")
+    if table is None: return None
+    dates, volume, inst, foreign = [], [], [], []
+    for row in table.iterfind('.//tr'):
+        cols = row.findall('td')
+        if len(cols) < 7: continue
+        date_str = _cell_text(cols[0]).replace('.', '')
+        if len(date_str) != 8: continue
+        values = [to_number(_cell_text(c)) for c in cols[4:7]]
+        if any(np.isnan(v) for v in values): continue
+        dates.append(date_str); volume.append(values[0]); inst.append(values[1]); foreign.append(values[2])
+    return {'날짜': np.array(dates, dtype=str), '거래량': np.array(volume, dtype=np.int64),
+            '기관': np.array(inst, dtype=np.int64), '외국인': np.array(foreign, dtype=np.int64)}
+
+def parse_market_sum(content):
+    """
+    시가총액 순위(sise_market_sum.naver) 표에서 종목코드/종목명/시가총액(억)/상장주식수(천주)를 추출합니다.
+    반환값: {'티커': str 배열, '종목명': str 배열, '시가총액': float 배열, '상장주식수': float 배열}, 표가 없으면 None
+    (상장주식수 컬럼이 표에 없으면 NaN)
+    """
+    table = _find_table(decode(content), 'class="tltle"', "contains(@class, 'type_2') and .//a[@class='tltle']")
+    if table is None: return None
+    headers = [_cell_text(th) for th in table.iterfind('.//th')]
+    if '시가총액' not in headers: return None
+    cap_idx = headers.index('시가총액')
+    shares_idx = headers.index('상장주식수') if '상장주식수' in headers else None
+    codes, names, caps, shares = [], [], [], []
+    for row in table.iterfind('.//tr'):
+        link = row.find('.//a[@class="tltle"]')
+        if link is None: continue
+        cols = row.findall('td')
+        if len(cols) <= cap_idx: continue
+        m = CODE_RE.search(link.get('href', ''))
+        if not m: continue
+        codes.append(m.group(1)); names.append(_cell_text(link)); caps.append(to_number(_cell_text(cols[cap_idx])))
+        shares.append(to_number(_cell_text(cols[shares_idx])) if shares_idx is not None and len(cols) > shares_idx else np.nan)
+    return {'티커': np.array(codes, dtype=str), '종목명': np.array(names, dtype=str), '시가총액': np.array(caps, dtype=float),
+            '상장주식수': np.array(shares, dtype=float)}
+
+def parse_financial_summary(content):
+    """
+    종목 메인(main.naver)의 '주요재무정보' 표를 추출합니다.
+    반환값: {'periods': 기간 라벨 리스트 (예: '2025.09', '2025.12(E)'), 'rows': {항목명: float 배열}}, 표가 없으면 None
+    앞쪽 컬럼은 연간 실적, 뒤쪽 컬럼은 분기 실적입니다.
+    """
+    table = _find_table(decode(content), '주요재무정보', ".//th[contains(., '주요재무정보')]")
+    if table is None: return None
+    trs = table.findall('.//tr')
+    head_rows = [tr for tr in trs if tr.find('td') is None]
+    if len(head_rows) < 2: return None
+    periods = [_cell_text(th) for th in head_rows[1].findall('th')]
+    rows = {}
+    for row in trs:
+        th, tds = row.find('th'), row.findall('td')
+        if th is None or not tds: continue
+        values = [to_number(_cell_text(td)) for td in tds]
+        if len(values) == len(periods):
+            rows.setdefault(_cell_text(th), np.array(values, dtype=float))
+    return {'periods': periods, 'rows': rows}
+
+def find_row(summary, label):
+    """
+    항목명이 label과 같은 행(없으면 label을 포함하는 첫 행)의 값 배열
+    """
+    rows = summary['rows']
+    if label in rows: return rows[label]
+    return next((v for k, v in rows.items() if label in k), None)
+
+def split_summary(summary, n_quarters=6):
+    """
+    주요재무정보를 연간/분기로 나눠 값이 있는 칸만 남깁니다.
+    반환값: {'Y': {항목: [(기간, 값), ...]}, 'Q': {...}} (뒤쪽 n_quarters개 컬럼이 분기)
+    """
+    periods = summary['periods']
+    n_years = len(periods) - n_quarters
+    items = {'Y': {}, 'Q': {}}
+    for label, values in summary['rows'].items():
+        for kind, cols in (('Y', range(n_years)), ('Q', range(n_years, len(periods)))):
+            items[kind][label] = [(periods[i], float(values[i])) for i in cols if not np.isnan(values[i])]
+    return items
+
+def find_item(by_item, label):
+    """
+    split_summary 결과의 {항목: 값 목록}에서 label과 같은(없으면 label을 포함하는 첫) 항목의 값 목록, 없으면 []
+    """
+    if label in by_item: return by_item[label]
+    return next((v for k, v in by_item.items() if label in k), [])
@@ -1,93 +1,184 @@
-import requests
 import pandas as pd
 from datetime import datetime
 import os
-import time
-import re
-from bs4 import BeautifulSoup
+import argparse
+import itertools
+from functools import partial
+from http_fetcher import Fetcher, get_fetcher
+from naver_parse import parse_market_sum, parse_financial_summary, split_summary, find_item
+from fundamentals_cache import FundamentalsCache, DEFAULT_PATH as DEFAULT_CACHE_PATH
+from run_stats import get_run_stats, reset_run_stats
+from ticker_master import get_ticker_master
+from screener_engine import SCREENS, ScreenerEngine, positive_int, positive_float, universe_from_master, render_screens
 
-def get_naver_market_sum(page=1):
-    url = f"https://finance.naver.com/sise/sise_market_sum.naver?&page={page}"
-    headers = {'User-Agent': 'Mozilla/5.0'}
+# 네이버 시가총액 순위 페이지의 시장 구분 (sosok)
+NAVER_MARKETS = {"KOSPI": 0, "KOSDAQ": 1}
+
+def get_naver_market_sum(page=1, fetcher=None, sosok=0):
+    url = f"https://finance.naver.com/sise/sise_market_sum.naver?sosok={sosok}&page={page}"
+    fetcher = fetcher or get_fetcher()
     try:
-        res = requests.get(url, headers=headers)
-        content = res.content.decode('cp949', 'ignore')
-        df_list = pd.read_html(content)
-        df = df_list[1]
-        df = df[df['종목명'].notna()].copy()
-        
-        soup = BeautifulSoup(content, 'html.parser')
-        links = soup.select('table.type_2 a.tltle')
-        tickers = [re.search(r'code=(\d+)', l['href']).group(1) for l in links]
-        df['티커'] = tickers
-        
-        return df[['티커', '종목명', '시가총액']]
+        res = fetcher.get(url)
+        table = parse_market_sum(res.content)
+        if table is None: return None
+        return pd.DataFrame(table)[['티커', '종목명', '시가총액', '상장주식수']]
     except Exception as e:
+        get_run_stats().record_exception("get_naver_market_sum", e)
         print(f"Error Page {page}: {e}")
         return None
 
-def get_last_4q_op_sum(ticker):
+def get_fundamentals(ticker, fetcher=None):
     """
-    네이버 금융에서 지난 4개 분기의 영업이익 합계를 구합니다.
+    네이버 금융 주요재무정보 전체를 {'Y': {항목: [(기간, 값), ...]}, 'Q': {...}}로 구합니다.
+    (분기 데이터 영역은 보통 마지막 6개 컬럼, 추정치(E) 포함)
+    페이지를 가져오지 못했거나(HTTP 오류 포함) 파싱에 실패하면 None, 재무정보 표가 없는 종목이면 빈 항목을 반환합니다.
     """
     url = f"https://finance.naver.com/item/main.naver?code={ticker}"
-    headers = {'User-Agent': 'Mozilla/5.0'}
+    fetcher = fetcher or get_fetcher()
     try:
-        res = requests.get(url, headers=headers)
-        content = res.content.decode('cp949', 'ignore')
-        df_list = pd.read_html(content)
-        
-        finance_df = None
-        for temp_df in df_list:
-            if any('주요재무정보' in str(col) for col in temp_df.columns):
-                finance_df = temp_df
-                break
-        
-        if finance_df is None: return None
-        
-        # '영업이익' 행 찾기
-        op_row = finance_df[finance_df.iloc[:, 0].astype(str).str.contains('영업이익', na=False)]
-        if op_row.empty: return None
-        
-        # 분기 데이터 영역 (보통 마지막 6개 컬럼이 분기 데이터)
-        # 그중 실적이 확정된 최근 4개 분기 데이터를 합산
-        quarter_data = op_row.iloc[0, -6:]
-        valid_values = []
-        for val in quarter_data:
-            # (E) 가 붙은 추정치는 제외하고 실제 확정치만 수집
-            # 하지만 최근 4분기 합산이 목적이므로 추정치가 섞여있을 수 있음
-            # 안전하게 숫자형으로 변환 가능한 것들 중 뒤에서 4개 추출
-            num = pd.to_numeric(val, errors='coerce')
-            if not pd.isna(num):
-                valid_values.append(num)
-        
-        if len(valid_values) < 4:
-            # 데이터가 4개 미만이면 있는 것만이라도 합산 (신규 상장사 등)
-            if not valid_values: return None
-            return int(sum(valid_values))
-            
-        # 가장 최근 4개 분기 합산
-        return int(sum(valid_values[-4:]))
-    except:
+        res = fetcher.get(url)
+        res.raise_for_status()
+    except Exception as e:
+        get_run_stats().record_exception("get_fundamentals.fetch", e)
         return None
+    try:
+        summary = parse_financial_summary(res.content)
+        if summary is None: return {'Y': {}, 'Q': {}}
+        return split_summary(summary)
+    except Exception as e:
+        get_run_stats().record_exception("get_fundamentals.parse", e)
+        return None
+
+def get_quarterly_op(ticker, fetcher=None):
+    """
+    네이버 금융 주요재무정보에서 분기별 영업이익 [(분기, 값), ...]을 구합니다.
+    페이지를 가져오지 못하면 None, 재무정보가 없는 종목이면 빈 리스트를 반환합니다.
+    """
+    items = get_fundamentals(ticker, fetcher)
+    return None if items is None else find_item(items['Q'], '영업이익')
+
+def sum_last_4q(values):
+    """
+    분기별 영업이익 중 가장 최근 4개 분기 합산
+    """
+    if not values: return None
+    # 데이터가 4개 미만이면 있는 것만이라도 합산 (신규 상장사 등)
+    return int(sum(v for _, v in values[-4:]))
 
-def main():
-    print("지난 4분기 영업이익 기반 저PER 종목 분석 시작 (상위 250개 종목)...")
+def get_last_4q_op_sum(ticker, fetcher=None):
+    """
+    네이버 금융에서 지난 4개 분기의 영업이익 합계를 구합니다.
+    """
+    values = get_quarterly_op(ticker, fetcher)
+    return sum_last_4q(values)
+
+def crawl_fundamentals(tickers, fetcher, cache=None, progress=True):
+    """
+    종목별 주요재무정보를 워커 풀로 동시에 수집합니다. {티커: 실적 데이터 또는 None}
+    cache(FundamentalsCache)가 주어지면 신선한 캐시가 없는 종목만 네트워크에서 가져오고,
+    정상적으로 파싱된 결과만 캐시에 저장합니다. progress가 False이면 진행 상황을 출력하지 않습니다.
+    """
+    counter = itertools.count(1)
+    def task(ticker):
+        items = cache.get_items(ticker) if cache else None
+        if items is None:
+            items = get_fundamentals(ticker, fetcher)
+            if cache and items is not None: cache.put_items(ticker, items)
+        if progress: print(f"실적 분석 중... {next(counter)}/{len(tickers)}", end='\r')
+        return items
+    return fetcher.fetch_all(task, tickers)
+
+def crawl_op_sums(tickers, fetcher, cache=None, progress=True):
+    """
+    종목별 4분기 영업이익 합계를 동시에 수집합니다. {티커: 영업이익합계}
+    """
+    items = crawl_fundamentals(tickers, fetcher, cache, progress)
+    return {t: sum_last_4q(None if v is None else find_item(v['Q'], '영업이익')) for t, v in items.items()}
+
+def load_universe(fetcher, max_pages=40):
+    """
+    KOSPI+KOSDAQ 전 종목 유니버스 표 (티커 인덱스, 시가총액 단위 억 원)
+    종목 마스터(pykrx)를 우선 사용하고, 비어 있으면 네이버 시가총액 순위 전 페이지로 대신합니다.
+    """
+    master = get_ticker_master()
+    if len(master.df): return universe_from_master(master)
+    keys = [(sosok, page) for sosok in NAVER_MARKETS.values() for page in range(1, max_pages + 1)]
+    pages = fetcher.fetch_all(lambda k: get_naver_market_sum(k[1], fetcher, sosok=k[0]), keys)
+    market_of = {v: k for k, v in NAVER_MARKETS.items()}
+    frames = [df.assign(시장=market_of[k[0]]) for k, df in pages.items() if df is not None]
+    if not frames: return None
+    df = pd.concat(frames).drop_duplicates(subset='티커').set_index('티커')
+    return pd.DataFrame({'종목명': df['종목명'], '시장': df['시장'], '업종': None,
+                         '상장주식수': df['상장주식수'] * 1000, '시가총액(억)': df['시가총액']})
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="지난 4분기 영업이익 기반 저PER 종목 스크리너")
+    parser.add_argument('--pages', type=positive_int, default=5, help="시가총액 순위 페이지 수 (페이지당 50종목)")
+    parser.add_argument('--workers', type=positive_int, default=8, help="동시 수집 워커 수")
+    parser.add_argument('--rps', type=positive_float, default=10, help="호스트별 초당 최대 요청 수")
+    parser.add_argument('--timeout', type=positive_float, default=10, help="요청당 타임아웃(초)")
+    parser.add_argument('--retries', type=int, default=3, help="요청 실패시 재시도 횟수")
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help="분기 실적 캐시 파일 경로")
+    parser.add_argument('--no-cache', action='store_true', help="캐시를 사용하지 않고 모두 새로 수집")
+    parser.add_argument('--full', action='store_true', help="KOSPI+KOSDAQ 전 종목을 대상으로 여러 스크린을 한 번에 평가")
+    parser.add_argument('--screens', nargs='+', choices=list(SCREENS), default=list(SCREENS), metavar="SCREEN",
+                        help=f"--full 모드에서 평가할 스크린 (기본: 전체, 선택: {', '.join(SCREENS)})")
+    parser.add_argument('--top', type=positive_int, default=50, help="--full 모드에서 스크린별 상위 종목 수")
+    return parser.parse_args()
+
+def run_full(args, fetcher, stats):
+    """
+    전 종목 유니버스를 한 번 수집해 여러 스크린을 평가하고 reports/screener_DATE.md로 저장합니다.
+    """
+    print(f"KOSPI+KOSDAQ 전 종목 멀티 스크리너 시작 ({', '.join(args.screens)})...")
+    with stats.stage("universe"):
+        universe = load_universe(fetcher)
+    if universe is None or universe.empty: return
+    engine = ScreenerEngine(universe)
+
+    cache = None if args.no_cache else FundamentalsCache(args.cache)
+    with stats.stage("fundamentals"):
+        items = crawl_fundamentals(engine.table.index.tolist(), fetcher, cache)
+    if cache: cache.close()
+
+    today_str = datetime.now().strftime('%Y-%m-%d')
+    filename = f"reports/screener_{today_str}.md"
+    os.makedirs("reports", exist_ok=True)
+    with stats.stage("screens"):
+        engine.fill_fundamentals(items)
+        report = render_screens(engine, args.screens, args.top, today_str)
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(report)
+    summary_file = stats.write_json(filename.replace(".md", ".run.json"))
+    print(f"\n리포트 생성 및 저장 완료: {filename} (스크린 {len(args.screens)}개, 실행 요약: {summary_file})")
+
+def main(args=None):
+    args = args or parse_args()
+    if args.full:
+        stats = reset_run_stats("screener")
+        fetcher = Fetcher(max_workers=args.workers, rate_per_host=args.rps, timeout=args.timeout, retries=args.retries)
+        return run_full(args, fetcher, stats)
+    stats = reset_run_stats("per_screener")
+    print(f"지난 4분기 영업이익 기반 저PER 종목 분석 시작 (상위 {args.pages * 50}개 종목)...")
+    fetcher = Fetcher(max_workers=args.workers, rate_per_host=args.rps, timeout=args.timeout, retries=args.retries)
     
-    # 1. 시총 상위 250개 종목 기본 정보 가져오기 (5페이지)
-    base_data = []
-    for p in range(1, 6):
-        df = get_naver_market_sum(p)
-        if df is not None: base_data.append(df)
-        time.sleep(0.1)
+    # 1. 시총 상위 종목 기본 정보 가져오기 (페이지당 50종목)
+    with stats.stage("market_sum"):
+        pages = fetcher.fetch_all(partial(get_naver_market_sum, fetcher=fetcher), range(1, args.pages + 1))
+    base_data = [df for df in pages.values() if df is not None]
     
     if not base_data: return
-    full_df = pd.concat(base_data)
+    full_df = pd.concat(base_data).drop_duplicates(subset='티커')
+    
+    # 2. 종목별 실적 동시 수집 (캐시가 만료된 종목만)
+    cache = None if args.no_cache else FundamentalsCache(args.cache)
+    with stats.stage("fundamentals"):
+        op_sums = crawl_op_sums(full_df['티커'].tolist(), fetcher, cache)
+    if cache: cache.close()
     
     results = []
     for _, row in full_df.iterrows():
-        print(f"[{row['종목명']}] 실적 분석 중...", end='\r')
-        op_sum = get_last_4q_op_sum(row['티커'])
+        op_sum = op_sums.get(row['티커'])
         
         if op_sum and op_sum > 0:
             mkt_cap = float(str(row['시가총액']).replace(',', ''))
@@ -100,7 +191,6 @@ def main():
                 '시가총액(억)': int(mkt_cap),
                 '최근4분기영익합계(억)': op_sum
             })
-        time.sleep(0.03) # 속도 개선을 위해 대기시간 소폭 단축
         
     if results:
         res_df = pd.DataFrame(results)
@@ -119,7 +209,7 @@ def main():
         filename = f"reports/per_screener_{today_str}.md"
         os.makedirs("reports", exist_ok=True)
         
-        with open(filename, "w", encoding="utf-8") as f:
+        with stats.stage("render"), open(filename, "w", encoding="utf-8") as f:
             f.write(f"# 4분기 합산 영업이익 기반 저PER 종목 리포트 ({today_str})\n\n")
             f.write("## 📉 지난 4개 분기 실적 합계 기준 저평가 TOP 50\n\n")
             f.write("본 리포트는 당기순이익 대신 **최근 4개 분기의 실제 영업이익 합계**를 기준으로 PER을 계산했습니다.\n\n")
@@ -129,8 +219,8 @@ def main():
             f.write(top_50.to_markdown(index=False))
             f.write("\n\n*본 리포트는 네이버 금융 데이터를 기반으로 자동 생성되었습니다.*")
             
-        print(f"\n리포트 생성 및 저장 완료: {filename} (TOP 50)")
+        summary_file = stats.write_json(filename.replace(".md", ".run.json"))
+        print(f"\n리포트 생성 및 저장 완료: {filename} (TOP 50, 실행 요약: {summary_file})")
 
 if __name__ == "__main__":
-    from bs4 import BeautifulSoup
     main()
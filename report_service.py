@@ -0,0 +1,311 @@
+"""
+상주 서비스 모드: 데이터를 메모리에 유지하며 주기적으로 갱신하고, 요청 시 리포트를 즉시 생성합니다.
+
+- 종목 마스터, 섹터 가격/수급 패널과 섹터 지표, 섹터 뉴스, 전 종목 실적 표를 각각의 주기로 증분 갱신합니다.
+  (가격/수급은 timeseries 저장소, 실적은 fundamentals 캐시, 뉴스는 피드 캐시를 그대로 사용)
+- 리포트 요청은 이미 계산된 표로 마크다운만 만들기 때문에 네트워크 요청 없이 바로 응답합니다.
+- 로컬 HTTP 엔드포인트 또는 CLI(get)로 요청합니다.
+
+사용법:
+    python report_service.py serve                           # 127.0.0.1:8765 에서 서비스 시작
+    python report_service.py serve --market-interval 120 --periods 20d,YTD
+    python report_service.py get report                      # reports/report_DATE.md 로 저장
+    python report_service.py get screener --screens 저PBR --top 30 -o -   # 표준 출력
+    python report_service.py get status
+    python report_service.py refresh market
+
+HTTP:
+    GET  /report                                섹터 리포트 (마크다운)
+    GET  /screener?screens=저PBR,저EV/EBIT&top=30   전 종목 멀티 스크리너 (마크다운)
+    GET  /status                                작업별 갱신 상태와 누적 실행 요약 (JSON)
+    POST /refresh?job=market                    작업 즉시 실행
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlencode, urlparse
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError
+
+from http_fetcher import get_fetcher
+from ticker_master import get_ticker_master, reload_ticker_master
+from run_stats import get_run_stats, reset_run_stats
+from timeseries_store import TimeSeriesStore
+from sector_news import FeedCache, get_all_sector_news
+from sector_metrics import compute_sector_metrics, required_since
+from fundamentals_cache import FundamentalsCache, DEFAULT_PATH as DEFAULT_CACHE_PATH
+from screener_engine import SCREENS, ScreenerEngine, positive_int, render_screens
+from stock_report import (get_sector_data, get_ticker_universe, get_ticker_name, update_price_panel, update_investor_flows,
+                          flow_coverage, build_periods, period_list, build_report_table, render_report, clear_investor_cache)
+from per_screener import load_universe, crawl_fundamentals
+
+DEFAULT_HOST, DEFAULT_PORT = "127.0.0.1", 8765
+
+class Job:
+    """
+    interval초마다 func를 실행하는 백그라운드 작업 (trigger()로 즉시 실행)
+    """
+    def __init__(self, name, func, interval):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.wake = threading.Event()
+        self.running = False
+        self.runs = 0
+        self.last_run = None
+        self.last_seconds = None
+        self.last_error = None
+
+    def run_once(self):
+        self.running = True
+        start = time.perf_counter()
+        try:
+            with get_run_stats().stage(f"service.{self.name}"):
+                self.func()
+            self.last_error = None
+        except Exception as e:
+            get_run_stats().record_exception(f"service.{self.name}", e)
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"[경고] {self.name} 갱신 실패: {self.last_error}")
+        finally:
+            self.running = False
+            self.runs += 1
+            self.last_run = datetime.now().isoformat(timespec='seconds')
+            self.last_seconds = round(time.perf_counter() - start, 3)
+
+    def loop(self, stop):
+        while not stop.is_set():
+            self.run_once()
+            self.wake.wait(self.interval)
+            self.wake.clear()
+
+    def trigger(self):
+        self.wake.set()
+
+    def status(self):
+        return {"interval": self.interval, "running": self.running, "runs": self.runs, "last_run": self.last_run,
+                "last_seconds": self.last_seconds, "last_error": self.last_error}
+
+class ReportService:
+    """
+    리포트/스크리너에 필요한 데이터를 메모리에 유지하는 상주 서비스
+    - 각 작업은 새 데이터를 모두 만든 뒤 참조만 바꿔 끼우므로, 갱신 중에도 이전 데이터로 바로 응답합니다.
+    """
+    def __init__(self, periods=None, fundamentals_path=DEFAULT_CACHE_PATH, intervals=None):
+        self.periods = periods or build_periods()
+        self.sectors = get_sector_data()
+        self.universe = get_ticker_universe(self.sectors)
+        self.price_store, self.flow_store = TimeSeriesStore("prices"), TimeSeriesStore("flows")
+        self.news_cache = FeedCache()
+        self.fundamentals_path = fundamentals_path
+        self.panel = self.naver_dfs = self.report_df = self.engine = None
+        self.sector_news = {}
+        intervals = intervals or {}
+        self.jobs = {
+            "master": Job("master", self.refresh_master, intervals.get("master", 86400)),
+            "market": Job("market", self.refresh_market, intervals.get("market", 300)),
+            "news": Job("news", self.refresh_news, intervals.get("news", 600)),
+            "fundamentals": Job("fundamentals", self.refresh_fundamentals, intervals.get("fundamentals", 21600)),
+        }
+        self.stop = threading.Event()
+        self.threads = []
+
+    def refresh_master(self):
+        reload_ticker_master()
+
+    def refresh_market(self):
+        """
+        가격은 마지막 저장일 이후 봉만, 수급은 마지막 거래일보다 오래된 종목만 받아 저장소에 추가하고 섹터 지표를 다시 계산합니다.
+        """
+        since = required_since(self.periods)
+        panel = update_price_panel(self.universe, self.price_store, since=since)
+        if panel is None: raise RuntimeError("가격 데이터를 받지 못했습니다.")
+        clear_investor_cache()  # 실행 단위 메모이즈 → 상주 모드에서는 갱신마다 비움
+        naver_dfs = update_investor_flows(self.universe, self.flow_store, panel.index[-1].strftime("%Y%m%d"), since=since)
+        all_metrics = compute_sector_metrics(panel, naver_dfs, self.sectors, self.periods, name_of=get_ticker_name,
+                                             flow_since=flow_coverage(self.universe, self.flow_store))
+        self.panel, self.naver_dfs, self.report_df = panel, naver_dfs, build_report_table(all_metrics, self.sectors)
+
+    def refresh_news(self):
+        df = self.report_df
+        sectors = {s: self.sectors[s] for s in df["섹터"]} if df is not None else self.sectors
+        self.sector_news = get_all_sector_news(sectors, name_of=get_ticker_name, cache=self.news_cache)
+
+    def refresh_fundamentals(self):
+        """
+        전 종목 유니버스와 실적 표를 다시 구성합니다. 실적은 캐시가 만료된 종목만 네트워크에서 받습니다.
+        """
+        fetcher = get_fetcher()
+        universe = load_universe(fetcher)
+        if universe is None or universe.empty: raise RuntimeError("종목 유니버스를 불러오지 못했습니다.")
+        engine = ScreenerEngine(universe)
+        cache = FundamentalsCache(self.fundamentals_path)
+        try:
+            items = crawl_fundamentals(engine.table.index.tolist(), fetcher, cache, progress=False)
+        finally:
+            cache.close()
+        engine.fill_fundamentals(items)
+        self.engine = engine
+
+    def render_sector_report(self):
+        df, news = self.report_df, self.sector_news
+        if df is None: return None
+        with get_run_stats().stage("service.render_report"):
+            return render_report(df, news, self.sectors, self.periods, datetime.now().strftime('%Y-%m-%d'))
+
+    def render_screener(self, screens=None, top=50):
+        engine = self.engine
+        if engine is None: return None
+        with get_run_stats().stage("service.render_screener"):
+            return render_screens(engine, screens or list(SCREENS), top, datetime.now().strftime('%Y-%m-%d'))
+
+    def status(self):
+        return {"jobs": {name: job.status() for name, job in self.jobs.items()},
+                "ready": {"report": self.report_df is not None, "screener": self.engine is not None},
+                "stats": get_run_stats().summary()}
+
+    def start(self):
+        """
+        종목 마스터를 먼저 로드한 뒤 작업별 스레드를 시작합니다.
+        """
+        get_ticker_master()
+        for name, job in self.jobs.items():
+            t = threading.Thread(target=job.loop, args=(self.stop,), name=f"job-{name}", daemon=True)
+            t.start()
+            self.threads.append(t)
+
+    def shutdown(self):
+        self.stop.set()
+        for job in self.jobs.values(): job.trigger()
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    def _send(self, status, body, content_type="text/markdown; charset=utf-8"):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status, obj):
+        self._send(status, json.dumps(obj, ensure_ascii=False, indent=2), "application/json; charset=utf-8")
+
+    def do_GET(self):
+        service = self.server.service
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/status":
+            return self._send_json(200, service.status())
+        if url.path == "/report":
+            body = service.render_sector_report()
+        elif url.path == "/screener":
+            screens = [s for v in query.get("screens", []) for s in v.split(',') if s]
+            unknown = [s for s in screens if s not in SCREENS]
+            if unknown: return self._send_json(400, {"error": f"알 수 없는 스크린: {', '.join(unknown)}", "screens": list(SCREENS)})
+            try: top = int(query.get("top", ["50"])[0])
+            except ValueError: top = 0
+            if top < 1: return self._send_json(400, {"error": "top은 1 이상의 정수여야 합니다."})
+            body = service.render_screener(screens, top)
+        else:
+            return self._send_json(404, {"error": "not found"})
+        if body is None: return self._send_json(503, {"error": "데이터를 준비 중입니다.", "jobs": service.status()["jobs"]})
+        self._send(200, body)
+
+    def do_POST(self):
+        service = self.server.service
+        url = urlparse(self.path)
+        if url.path != "/refresh": return self._send_json(404, {"error": "not found"})
+        names = parse_qs(url.query).get("job", list(service.jobs))
+        unknown = [n for n in names if n not in service.jobs]
+        if unknown: return self._send_json(400, {"error": f"알 수 없는 작업: {', '.join(unknown)}", "jobs": list(service.jobs)})
+        for n in names: service.jobs[n].trigger()
+        self._send_json(202, {"triggered": names})
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(args):
+    reset_run_stats("report_service")
+    periods = build_periods(args.periods)
+    intervals = {"master": args.master_interval, "market": args.market_interval, "news": args.news_interval,
+                 "fundamentals": args.fundamentals_interval}
+    service = ReportService(periods, args.cache, intervals)
+    service.start()
+    server = ThreadingHTTPServer((args.host, args.port), ServiceHandler)
+    server.service = service
+    print(f"리포트 서비스 시작: http://{args.host}:{args.port} (/report, /screener, /status, POST /refresh)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.shutdown()
+        server.server_close()
+
+def request(args, method, path, params=None):
+    url = f"http://{args.host}:{args.port}{path}" + (f"?{urlencode(params, quote_via=quote)}" if params else "")
+    try:
+        with urlopen(Request(url, method=method), timeout=args.timeout) as res:
+            return res.status, res.read().decode('utf-8')
+    except HTTPError as e:
+        return e.code, e.read().decode('utf-8')
+
+def get(args):
+    params = {}
+    if args.what == "screener":
+        if args.screens: params["screens"] = ",".join(args.screens)
+        params["top"] = args.top
+    status, body = request(args, "GET", f"/{args.what}", params)
+    if status != 200 or args.what == "status" or args.out == "-":
+        print(body); return status
+    today_str = datetime.now().strftime('%Y-%m-%d')
+    filename = args.out or f"reports/{'report' if args.what == 'report' else 'screener'}_{today_str}.md"
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(body)
+    print(f"리포트 저장 완료: {filename}")
+    return status
+
+def refresh(args):
+    status, body = request(args, "POST", "/refresh", [("job", j) for j in args.jobs])
+    print(body)
+    return status
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="섹터 리포트/스크리너 상주 서비스")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="서비스 주소")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="서비스 포트")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("serve", help="서비스 시작")
+    p.add_argument('--periods', type=period_list, default="", help="섹터 리포트 추가 기간 (쉼표 구분): 20d,60d,YTD,20250101:20250131")
+    p.add_argument('--cache', default=DEFAULT_CACHE_PATH, help="실적 캐시 파일 경로")
+    p.add_argument('--market-interval', type=float, default=300, help="가격/수급/섹터 지표 갱신 주기(초)")
+    p.add_argument('--news-interval', type=float, default=600, help="뉴스 갱신 주기(초)")
+    p.add_argument('--fundamentals-interval', type=float, default=21600, help="전 종목 실적 표 갱신 주기(초)")
+    p.add_argument('--master-interval', type=float, default=86400, help="종목 마스터 갱신 주기(초)")
+
+    p = sub.add_parser("get", help="실행 중인 서비스에 리포트 요청")
+    p.add_argument('what', choices=["report", "screener", "status"])
+    p.add_argument('--screens', nargs='+', choices=list(SCREENS), metavar="SCREEN", help=f"스크린 선택 ({', '.join(SCREENS)})")
+    p.add_argument('--top', type=positive_int, default=50, help="스크린별 상위 종목 수")
+    p.add_argument('-o', '--out', help="저장 경로 (기본: reports/ 아래 날짜별 파일, '-'이면 표준 출력)")
+    p.add_argument('--timeout', type=float, default=30, help="요청 타임아웃(초)")
+
+    p = sub.add_parser("refresh", help="실행 중인 서비스의 갱신 작업 즉시 실행")
+    p.add_argument('jobs', nargs='*', metavar="JOB", help="master, market, news, fundamentals (생략하면 전체)")
+    p.add_argument('--timeout', type=float, default=30, help="요청 타임아웃(초)")
+    return parser.parse_args()
+
+def main(args=None):
+    args = args or parse_args()
+    if args.command == "serve": return serve(args)
+    status = get(args) if args.command == "get" else refresh(args)
+    raise SystemExit(0 if status in (200, 202) else 1)
+
+if __name__ == "__main__":
+    main()
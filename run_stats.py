@@ -0,0 +1,92 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+class RunStats:
+    """
+    실행 단위 계측 기록기 (여러 스레드에서 공유)
+    - 단계별 소요 시간, 호스트별 요청 시간/전송량/재시도/실패, 캐시 적중/미스, 삼킨 예외
+    - 예외는 위치별 누적 횟수와 최근 max_errors개의 내용만 유지 (상주 서비스에서도 최근 실패가 보이도록)
+    """
+    def __init__(self, name="run", max_errors=200):
+        self.name = name
+        self.started = time.time()
+        self.stages = {}
+        self.hosts = {}
+        self.caches = {}
+        self.errors = deque(maxlen=max_errors)
+        self.error_counts = {}
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                s = self.stages.setdefault(name, {"count": 0, "seconds": 0.0})
+                s["count"] += 1
+                s["seconds"] += elapsed
+
+    def record_request(self, url, seconds, nbytes=0, status=None, retries=0, ok=True):
+        host = urlparse(url).netloc or url
+        with self.lock:
+            h = self.hosts.setdefault(host, {"requests": 0, "failures": 0, "retries": 0, "bytes": 0, "seconds": 0.0, "max_seconds": 0.0, "status": {}})
+            h["requests"] += 1
+            h["failures"] += 0 if ok else 1
+            h["retries"] += retries
+            h["bytes"] += nbytes
+            h["seconds"] += seconds
+            h["max_seconds"] = max(h["max_seconds"], seconds)
+            if status is not None:
+                h["status"][str(status)] = h["status"].get(str(status), 0) + 1
+
+    def record_cache(self, name, hit, count=1):
+        with self.lock:
+            c = self.caches.setdefault(name, {"hits": 0, "misses": 0})
+            c["hits" if hit else "misses"] += count
+
+    def record_exception(self, where, exc):
+        with self.lock:
+            self.error_counts[where] = self.error_counts.get(where, 0) + 1
+            self.errors.append({"where": where, "type": type(exc).__name__, "message": str(exc)[:300]})
+
+    def summary(self):
+        with self.lock:
+            hosts = {}
+            for host, h in self.hosts.items():
+                hosts[host] = dict(h, avg_seconds=round(h["seconds"] / h["requests"], 4) if h["requests"] else 0)
+            return {
+                "name": self.name,
+                "started_at": datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+                "total_seconds": round(time.time() - self.started, 3),
+                "stages": {k: {"count": v["count"], "seconds": round(v["seconds"], 3)} for k, v in self.stages.items()},
+                "hosts": hosts,
+                "caches": dict(self.caches),
+                "exception_counts": dict(self.error_counts),
+                "exceptions": list(self.errors),
+            }
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+        return path
+
+_stats = RunStats()
+
+def get_run_stats():
+    return _stats
+
+def reset_run_stats(name="run"):
+    """
+    새 실행 기록을 시작합니다. (스크립트 main 시작 시 호출)
+    """
+    global _stats
+    _stats = RunStats(name)
+    return _stats
@@ -0,0 +1,165 @@
+import argparse
+import operator
+
+import numpy as np
+import pandas as pd
+
+from naver_parse import find_item
+
+# 금액 단위: 억 원 (BPS는 원, 상장주식수는 주)
+UNIVERSE_COLUMNS = ['종목명', '시장', '업종', '상장주식수', '시가총액(억)']
+FUNDAMENTAL_COLUMNS = ['4분기매출액(억)', '4분기영업이익(억)', '4분기순이익(억)', 'BPS', '부채비율%', '매출성장률%', '영업이익성장률%']
+FILTER_OPS = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le}
+
+SCREENS = {
+    "저PER(영업이익)": {"sort_by": "영업이익PER", "filters": [("영업이익PER", ">", 0.5)],
+                      "columns": ["종목명", "영업이익PER", "시가총액(억)", "4분기영업이익(억)"],
+                      "desc": "시가총액 / 최근 4개 분기 영업이익 합계"},
+    "저PER(순이익)": {"sort_by": "PER", "filters": [("PER", ">", 0.5)],
+                    "columns": ["종목명", "PER", "시가총액(억)", "4분기순이익(억)"],
+                    "desc": "시가총액 / 최근 4개 분기 당기순이익 합계"},
+    "저PBR": {"sort_by": "PBR", "filters": [("PBR", ">", 0.05), ("4분기순이익(억)", ">", 0)],
+             "columns": ["종목명", "PBR", "시가총액(억)", "자본(억)", "4분기순이익(억)"],
+             "desc": "시가총액 / (BPS x 상장주식수), 최근 4분기 순이익 흑자 종목"},
+    "저EV/EBIT": {"sort_by": "EV/EBIT", "filters": [("EV/EBIT", ">", 0.5)],
+                 "columns": ["종목명", "EV/EBIT", "시가총액(억)", "부채(억)", "4분기영업이익(억)"],
+                 "desc": "(시가총액 + 부채총계 근사치) / 최근 4개 분기 영업이익 합계 (현금 미차감)"},
+    "성장 대비 저평가": {"sort_by": "영업이익PER", "filters": [("영업이익성장률%", ">=", 20), ("영업이익PER", ">", 0.5)],
+                   "columns": ["종목명", "영업이익PER", "영업이익성장률%", "매출성장률%", "시가총액(억)"],
+                   "desc": "최근 연간 영업이익 20% 이상 성장 종목 중 영업이익PER 하위"},
+}
+
+def positive_int(text):
+    """
+    argparse용 1 이상 정수 (스크린별 상위 종목 수, 워커 수 등)
+    """
+    value = int(text)
+    if value < 1: raise argparse.ArgumentTypeError(f"1 이상의 정수여야 합니다: {text}")
+    return value
+
+def positive_float(text):
+    """
+    argparse용 0보다 큰 실수 (초당 요청 수, 타임아웃)
+    """
+    value = float(text)
+    if not value > 0: raise argparse.ArgumentTypeError(f"0보다 큰 수여야 합니다: {text}")
+    return value
+
+def _sum_last(values, n=4):
+    """
+    가장 최근 n개 값 합산 (n개 미만이면 있는 것만, 없으면 NaN)
+    """
+    return float(sum(v for _, v in values[-n:])) if values else np.nan
+
+def _actual(values):
+    """
+    추정치(E)를 제외한 확정 실적만
+    """
+    return [(p, v) for p, v in values if '(E)' not in p]
+
+def _growth(values):
+    """
+    최근 두 확정 연간 실적의 증가율(%) (직전값이 0 이하이면 NaN)
+    """
+    if len(values) < 2 or values[-2][1] <= 0: return np.nan
+    return round((values[-1][1] / values[-2][1] - 1) * 100, 1)
+
+def fundamentals_record(items):
+    """
+    종목의 실적 데이터 {'Q': {...}, 'Y': {...}}를 스크리너 컬럼 값으로 요약합니다.
+    """
+    q, y = items.get('Q', {}), items.get('Y', {})
+    bps, debt = _actual(find_item(y, 'BPS')), _actual(find_item(y, '부채비율'))
+    return {
+        '4분기매출액(억)': _sum_last(find_item(q, '매출액')),
+        '4분기영업이익(억)': _sum_last(find_item(q, '영업이익')),
+        '4분기순이익(억)': _sum_last(find_item(q, '당기순이익')),
+        'BPS': bps[-1][1] if bps else np.nan,
+        '부채비율%': debt[-1][1] if debt else np.nan,
+        '매출성장률%': _growth(_actual(find_item(y, '매출액'))),
+        '영업이익성장률%': _growth(_actual(find_item(y, '영업이익'))),
+    }
+
+def universe_from_master(master):
+    """
+    종목 마스터(TickerMaster)를 스크리너 유니버스 표로 변환 (시가총액 원 -> 억 원)
+    """
+    df = master.df
+    return pd.DataFrame({
+        '종목명': df['종목명'], '시장': df['시장'], '업종': df['업종'],
+        '상장주식수': pd.to_numeric(df['상장주식수'], errors='coerce'),
+        '시가총액(억)': pd.to_numeric(df['시가총액'], errors='coerce') / 1e8,
+    }, index=df.index.rename('티커'))
+
+class ScreenerEngine:
+    """
+    전 종목 컬럼형 표 하나에 기본정보/실적/지표를 모아두고 여러 스크린을 벡터 연산으로 평가합니다.
+    - table: 티커 인덱스, UNIVERSE_COLUMNS + FUNDAMENTAL_COLUMNS + 파생 지표 컬럼
+    """
+    def __init__(self, universe):
+        self.table = universe.reindex(columns=UNIVERSE_COLUMNS).copy()
+
+    def fill_fundamentals(self, items_by_ticker):
+        """
+        {티커: 실적 데이터 또는 None}을 표에 채우고 파생 지표를 다시 계산합니다.
+        """
+        records = {t: fundamentals_record(items) for t, items in items_by_ticker.items() if items}
+        funda = pd.DataFrame.from_dict(records, orient='index').reindex(columns=FUNDAMENTAL_COLUMNS)
+        table = self.table.drop(columns=FUNDAMENTAL_COLUMNS, errors='ignore')
+        existing = self.table.reindex(columns=FUNDAMENTAL_COLUMNS)
+        self.table = table.join(funda.combine_first(existing), how='left')
+        self.compute_ratios()
+
+    def compute_ratios(self):
+        t = self.table
+        cap = t['시가총액(억)'].to_numpy(dtype=float)
+        op = t['4분기영업이익(억)'].to_numpy(dtype=float)
+        ni = t['4분기순이익(억)'].to_numpy(dtype=float)
+        rev = t['4분기매출액(억)'].to_numpy(dtype=float)
+        equity = t['BPS'].to_numpy(dtype=float) * t['상장주식수'].to_numpy(dtype=float) / 1e8
+        debt = equity * t['부채비율%'].to_numpy(dtype=float) / 100
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t['영업이익PER'] = np.where(op > 0, cap / op, np.nan).round(2)
+            t['PER'] = np.where(ni > 0, cap / ni, np.nan).round(2)
+            t['자본(억)'] = equity.round(0)
+            t['부채(억)'] = debt.round(0)
+            t['PBR'] = np.where(equity > 0, cap / equity, np.nan).round(2)
+            # 부채를 모르는 종목(BPS/부채비율 없음)은 EV를 시가총액으로 과소평가하지 않도록 NaN으로 둠
+            t['EV/EBIT'] = np.where(op > 0, (cap + debt) / op, np.nan).round(2)
+            t['영업이익률%'] = np.where(rev > 0, op / rev * 100, np.nan).round(1)
+
+    def screen(self, spec, top=50, ascending=True):
+        """
+        spec(SCREENS 항목)의 필터를 적용하고 sort_by 기준 상위 top개를 부분 정렬(argpartition)로 선택합니다.
+        """
+        if top < 1: raise ValueError(f"top은 1 이상이어야 합니다: {top}")
+        t = self.table
+        key = t[spec['sort_by']].to_numpy(dtype=float)
+        mask = ~np.isnan(key)
+        for col, op, value in spec.get('filters', []):
+            with np.errstate(invalid='ignore'):
+                mask &= FILTER_OPS[op](t[col].to_numpy(dtype=float), value)
+        idx = np.flatnonzero(mask)
+        vals = key[idx] if ascending else -key[idx]
+        if len(idx) > top:
+            part = np.argpartition(vals, top - 1)[:top]
+            idx, vals = idx[part], vals[part]
+        idx = idx[np.argsort(vals, kind='stable')]
+        return t.iloc[idx][spec['columns']].reset_index()
+
+def render_screens(engine, names, top, today_str):
+    """
+    여러 스크린 결과를 하나의 마크다운 리포트로 생성
+    """
+    out = [f"# 전 종목 멀티 스크리너 리포트 ({today_str})\n\n",
+           f"KOSPI+KOSDAQ 전체 {len(engine.table):,}개 종목을 한 번 수집한 데이터로 여러 기준을 평가했습니다.\n\n",
+           "- **모든 금액 단위:** 억 원\n- **4분기:** 최근 4개 분기 합계, **성장률:** 최근 두 확정 연간 실적 기준\n\n"]
+    for name in names:
+        spec = SCREENS[name]
+        result = engine.screen(spec, top)
+        amounts = [c for c in result.columns if c.endswith('(억)')]
+        result[amounts] = result[amounts].round().astype('Int64')
+        out.append(f"## {name} TOP {top}\n\n- {spec['desc']}\n\n")
+        out.append((result.to_markdown(index=False) if not result.empty else "해당 종목이 없습니다.") + "\n\n")
+    out.append("*본 리포트는 네이버 금융 및 KRX 데이터를 기반으로 자동 생성되었습니다.*")
+    return "".join(out)
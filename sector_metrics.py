@@ -0,0 +1,184 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# 기간 spec 형식
+# - 'Nd'                     : 최근 N거래일 (예: '1d', '5d', '20d', '60d')
+# - 'YTD'                    : 올해 첫 거래일부터 최근 거래일까지 (기준가는 전년 마지막 거래일)
+# - ('YYYYMMDD', 'YYYYMMDD') : 명시적 날짜 구간 (양 끝 포함)
+# - (시작, 종료, 기준)        : 가격 패널 날짜 위치 인덱스 (음수는 뒤에서부터)
+DEFAULT_PERIODS = {"당일": (-1, -1, -2), "어제": (-2, -2, -3), "주간": (-5, -1, -6)}
+FLOW_COLUMNS = {"개인": "개인", "외인": "외국인", "기관": "기관"}
+
+def parse_period(text):
+    """
+    CLI 문자열을 기간 spec으로 변환: '20d', 'YTD', '20250101:20250131'
+    """
+    text = text.strip()
+    if ':' in text:
+        start, end = text.split(':', 1)
+        for d in (start, end): datetime.strptime(d, "%Y%m%d")
+        return (start, end)
+    if text.upper() == 'YTD': return 'YTD'
+    if text[-1:].lower() == 'd' and text[:-1].isdigit() and int(text[:-1]) > 0: return text.lower()
+    raise ValueError(f"알 수 없는 기간 형식: {text}")
+
+def period_label(spec):
+    return f"{spec[0]}~{spec[1]}" if isinstance(spec, tuple) and len(spec) == 2 else str(spec)
+
+def resolve_period(spec, dates):
+    """
+    기간 spec을 날짜 배열('YYYYMMDD' 오름차순) 위의 (시작, 종료, 기준) 위치로 변환합니다.
+    데이터가 부족하면 None을 반환합니다.
+    """
+    n = len(dates)
+    if isinstance(spec, str):
+        if spec.upper() == 'YTD':
+            start = int(np.searchsorted(dates, dates[-1][:4] + "0101", side='left'))
+            end, base = n - 1, start - 1
+        else:
+            k = int(spec[:-1])
+            start, end, base = n - k, n - 1, n - k - 1
+    elif len(spec) == 2:
+        start = int(np.searchsorted(dates, spec[0], side='left'))
+        end = int(np.searchsorted(dates, spec[1], side='right')) - 1
+        base = start - 1
+    else:
+        start, end, base = (i + n if i < 0 else i for i in spec)
+    if not (0 <= base < n and 0 <= start <= end < n): return None
+    return start, end, base
+
+def required_since(periods, today=None):
+    """
+    기간 spec들을 계산하는 데 필요한 가격 이력 시작일 ('YYYYMMDD', 거래일 -> 달력일 여유 포함)
+    """
+    today = today or datetime.now()
+    bars, starts = 60, []
+    for spec in periods.values():
+        if isinstance(spec, str):
+            if spec.upper() == 'YTD': starts.append(datetime(today.year - 1, 12, 15))
+            else: bars = max(bars, int(spec[:-1]) + 1)
+        elif len(spec) == 2: starts.append(datetime.strptime(spec[0], "%Y%m%d") - timedelta(days=15))
+        else: bars = max(bars, max(abs(i) for i in spec))
+    starts.append(today - timedelta(days=bars * 7 // 5 + 15))
+    return min(starts).strftime("%Y%m%d")
+
+def build_membership(sectors, tickers):
+    """
+    섹터 x 종목 소속 행렬 (섹터 내 중복 종목은 횟수만큼 카운트)
+    """
+    col = {t: j for j, t in enumerate(tickers)}
+    m = np.zeros((len(sectors), len(tickers)))
+    for i, sector_tickers in enumerate(sectors.values()):
+        for t in sector_tickers:
+            m[i, col[t]] += 1
+    return m
+
+def _prefix_sum(values):
+    """
+    NaN을 0으로 본 행 방향 누적합 (맨 앞에 0 행 추가) -> 구간합 = c[hi] - c[lo]
+    """
+    c = np.nancumsum(values, axis=0)
+    return np.vstack([np.zeros((1, values.shape[1])), c])
+
+def build_flow_matrix(naver_dfs, tickers):
+    """
+    종목별 수급 DataFrame들을 날짜 x 종목 행렬로 합칩니다. (날짜 'YYYYMMDD' 오름차순, 컬럼별)
+    """
+    frames = {t: df.set_index('날짜') for t, df in naver_dfs.items() if df is not None and not df.empty}
+    if not frames:
+        return np.array([], dtype=str), {k: np.zeros((0, len(tickers))) for k in FLOW_COLUMNS}
+    wide = pd.concat(frames, axis=1).sort_index()
+    dates = wide.index.to_numpy(dtype=str)
+    mats = {}
+    for key, col in FLOW_COLUMNS.items():
+        sub = wide.xs(col, axis=1, level=1) if col in wide.columns.get_level_values(1) else pd.DataFrame(index=wide.index)
+        mats[key] = sub.reindex(columns=tickers).to_numpy(dtype=float)
+    return dates, mats
+
+def flow_first_dates(flow_dates, flow_mats, n_tickers):
+    """
+    종목별 수급 이력 첫 날짜 배열 (이력이 없는 종목은 '')
+    """
+    has = np.zeros((len(flow_dates), n_tickers), dtype=bool)
+    for mat in flow_mats.values():
+        has |= ~np.isnan(mat)
+    first = np.full(n_tickers, '', dtype='<U8')
+    if not len(flow_dates): return first
+    any_rows = has.any(axis=0)
+    first[any_rows] = flow_dates[has.argmax(axis=0)[any_rows]]
+    return first
+
+def compute_sector_metrics(panel, naver_dfs, sectors, periods=None, name_of=str, flow_since=None):
+    """
+    전체 섹터 x 전체 기간 지표를 종목 x 날짜 행렬 연산 한 번으로 계산합니다.
+    panel: (가격항목, 티커) 멀티컬럼 가격 패널, naver_dfs: {티커: 수급 DataFrame}
+    periods: {기간명: 기간 spec} (기본 DEFAULT_PERIODS), 데이터가 부족한 기간은 결과에서 제외
+    flow_since: {티커: 수급 이력이 빠짐없이 저장된 시작일 'YYYYMMDD' 또는 None} (기본: 종목별 첫 수급 날짜)
+    반환값: {섹터: {기간명: 지표 dict}}
+    섹터 내 종목의 수급 이력 시작일이 기간 시작일보다 늦으면 해당 기간의 개인/외인/기관은 None
+    (수급 데이터가 아예 없는 종목은 합계와 판정에서 모두 제외)
+    """
+    periods = periods or DEFAULT_PERIODS
+    tickers = list(dict.fromkeys(t for ts in sectors.values() for t in ts))
+    close_df = panel['Close'].reindex(columns=tickers).dropna(how='all')
+    if close_df.empty: return {}
+    volume_df = panel['Volume'].reindex(index=close_df.index, columns=tickers)
+    dates = close_df.index.strftime("%Y%m%d").to_numpy(dtype=str)
+    resolved = {name: resolve_period(spec, dates) for name, spec in periods.items()}
+    names = [name for name, pos in resolved.items() if pos is not None]
+    if not names: return {}
+    start, end, base = np.array([resolved[name] for name in names]).T
+
+    close = close_df.to_numpy(dtype=float)
+    m = build_membership(sectors, tickers)
+
+    # 수익률 (기간 x 종목)
+    c_end, c_base = close[end], close[base]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        valid = (c_base > 0) & ~np.isnan(c_end)
+        ret = np.where(valid, (c_end - c_base) / c_base * 100, 0.0)
+    up, down = valid & (ret > 0), valid & (ret < 0)
+
+    # 거래량 구간합 (기간 x 종목)
+    vol_c = _prefix_sum(volume_df.to_numpy(dtype=float))
+    vol = vol_c[end + 1] - vol_c[start]
+
+    # 수급 구간합: 날짜 문자열 구간 [시작일, 종료일]
+    flow_dates, flow_mats = build_flow_matrix(naver_dfs, tickers)
+    lo = np.searchsorted(flow_dates, dates[start], side='left')
+    hi = np.searchsorted(flow_dates, dates[end], side='right')
+    flows = {}
+    for key, mat in flow_mats.items():
+        fc = _prefix_sum(mat)
+        flows[key] = fc[hi] - fc[lo]
+    # 수급 이력이 기간 시작일보다 늦게 시작하는 종목 -> 해당 섹터/기간 수급 합계는 불완전 ('' = 수급 없음, 판정 제외)
+    if flow_since is None: flow_first = flow_first_dates(flow_dates, flow_mats, len(tickers))
+    else: flow_first = np.array([flow_since.get(t) or '' for t in tickers], dtype='<U8')
+    flow_short = flow_first[None, :] > dates[start][:, None]
+
+    # 섹터 집계 (섹터 x 기간)
+    total = m @ valid.T
+    up_c, down_c = m @ up.T, m @ down.T
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_ret = np.where(total > 0, (m @ ret.T) / total, 0.0)
+        up_ratio = np.where(total > 0, up_c / total * 100, 0.0)
+    sum_vol = m @ vol.T
+    sum_flows = {k: m @ v.T for k, v in flows.items()}
+    flow_incomplete = (m @ flow_short.T) > 0
+
+    col = {t: j for j, t in enumerate(tickers)}
+    result = {}
+    for i, (sector, sector_tickers) in enumerate(sectors.items()):
+        rep = col[sector_tickers[0]]
+        result[sector] = {}
+        for w, name in enumerate(names):
+            flow = {k: None if flow_incomplete[i, w] else int(sum_flows[k][i, w]) for k in FLOW_COLUMNS}
+            result[sector][name] = {
+                "가격%": round(float(avg_ret[i, w]), 2), "거래량": int(sum_vol[i, w]),
+                "개인": flow["개인"], "외인": flow["외인"], "기관": flow["기관"],
+                "상승/하락": f"{int(up_c[i, w])}/{int(down_c[i, w])}", "상승비율%": round(float(up_ratio[i, w]), 1),
+                "rep_name": name_of(sector_tickers[0]), "rep_price%": round(float(ret[w, rep]), 2), "rep_vol": int(vol[w, rep]),
+            }
+    return result
@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import io
+import os
+import time
+import urllib.parse
+import xml.etree.ElementTree as ET
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+from http_fetcher import get_fetcher
+from run_stats import get_run_stats
+
+DEFAULT_CACHE_DIR = os.path.join("cache", "news")
+
+class FeedCache:
+    """
+    검색어별 RSS 원문을 짧은 TTL 동안 디스크에 보관하는 캐시
+    """
+    def __init__(self, root=DEFAULT_CACHE_DIR, ttl_seconds=600):
+        self.root = root
+        self.ttl = ttl_seconds
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, query):
+        return os.path.join(self.root, hashlib.sha1(query.encode('utf-8')).hexdigest() + ".xml")
+
+    def get(self, query):
+        path = self.path(query)
+        fresh = os.path.exists(path) and time.time() - os.path.getmtime(path) <= self.ttl
+        get_run_stats().record_cache("news_feed", fresh)
+        if not fresh: return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def put(self, query, content):
+        tmp = self.path(query) + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(content)
+        os.replace(tmp, self.path(query))
+
+def build_news_query(sector, tickers, name_of=str):
+    company_names = [name_of(t) for t in tickers[:3]]
+    return f"({sector}) OR ({' OR '.join(company_names)}) 주식 뉴스"
+
+def news_url(query):
+    return f"https://news.google.com/rss/search?q={urllib.parse.quote(query)}&hl=ko&gl=KR&ceid=KR:ko"
+
+def parse_rss_items(content, allowed_date, limit=30):
+    """
+    RSS를 스트리밍(iterparse)으로 읽어 pubDate에 allowed_date가 포함된 기사만 limit개까지 추출합니다.
+    limit개를 채우면 나머지 문서는 파싱하지 않습니다.
+    """
+    items = []
+    for _, elem in ET.iterparse(io.BytesIO(content), events=('end',)):
+        if elem.tag != 'item': continue
+        pub_date, title, link = elem.findtext('pubDate') or '', elem.findtext('title'), elem.findtext('link')
+        elem.clear()
+        if allowed_date not in pub_date or not title: continue
+        if ' - ' in title: title = title.rsplit(' - ', 1)[0]
+        items.append({'title': title, 'link': link})
+        if len(items) >= limit: break
+    return items
+
+class NearDuplicateIndex:
+    """
+    제목 문자 shingle 기반 MinHash + LSH 근접 중복 탐지
+    - 후보는 LSH 버킷 충돌로만 찾고, 후보에 대해서만 실제 Jaccard/포함도를 확인
+    """
+    PRIME = (1 << 31) - 1
+
+    def __init__(self, threshold=0.5, num_perm=32, bands=16, k=3):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.k = k
+        rng = np.random.default_rng(1)
+        self.a = rng.integers(1, self.PRIME, num_perm, dtype=np.int64)
+        self.b = rng.integers(0, self.PRIME, num_perm, dtype=np.int64)
+        self.buckets = {}
+        self.shingles = []
+
+    def _shingles(self, text):
+        norm = "".join(text.split()).lower()
+        return {norm[i:i + self.k] for i in range(max(1, len(norm) - self.k + 1))}
+
+    def _signature(self, shingles):
+        x = np.array([zlib.crc32(s.encode('utf-8')) % self.PRIME for s in shingles], dtype=np.int64)
+        return ((np.outer(x, self.a) + self.b) % self.PRIME).min(axis=0)
+
+    def _band_keys(self, sig):
+        return [(i, sig[i * self.rows:(i + 1) * self.rows].tobytes()) for i in range(self.bands)]
+
+    def add_if_new(self, text):
+        """
+        기존 항목과 근접 중복이 아니면 색인에 추가하고 True, 중복이면 False를 반환합니다.
+        """
+        sh = self._shingles(text)
+        keys = self._band_keys(self._signature(sh))
+        candidates = {j for key in keys for j in self.buckets.get(key, ())}
+        for j in candidates:
+            other = self.shingles[j]
+            inter = len(sh & other)
+            if inter / len(sh | other) >= self.threshold or inter / min(len(sh), len(other)) >= 0.8: return False
+        idx = len(self.shingles)
+        self.shingles.append(sh)
+        for key in keys:
+            self.buckets.setdefault(key, []).append(idx)
+        return True
+
+def dedup_news(raw_news, limit=3):
+    index, result = NearDuplicateIndex(), []
+    for news in raw_news:
+        if index.add_if_new(news['title']):
+            result.append(f"- {news['title']} ([링크]({news['link']}))")
+            if len(result) >= limit: break
+    return result
+
+def fetch_feed(query, cache=None):
+    content = cache.get(query) if cache else None
+    if content is None:
+        res = get_fetcher().get(news_url(query))
+        res.raise_for_status()
+        content = res.content
+        if cache: cache.put(query, content)
+    return content
+
+async def _fetch_all_feeds(queries, cache, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+    async def one(query):
+        async with sem:
+            try: return await asyncio.to_thread(fetch_feed, query, cache)
+            except Exception as e:
+                get_run_stats().record_exception("sector_news.fetch_feed", e)
+                return None
+    return await asyncio.gather(*(one(q) for q in queries))
+
+def get_all_sector_news(sectors, name_of=str, cache=None, concurrency=8, limit=3, allowed_date=None):
+    """
+    모든 섹터의 뉴스 피드를 동시에 가져와 섹터별 중복 제거된 뉴스 목록을 반환합니다. {섹터: [마크다운 라인]}
+    allowed_date('DD Mon YYYY')를 주지 않으면 오늘 날짜 기사만 사용합니다.
+    """
+    cache = cache or FeedCache()
+    allowed_date = allowed_date or datetime.now().strftime("%d %b %Y")
+    queries = [build_news_query(s, t, name_of) for s, t in sectors.items()]
+    feeds = asyncio.run(_fetch_all_feeds(queries, cache, concurrency))
+    result = {}
+    for sector, content in zip(sectors, feeds):
+        if content is None:
+            result[sector] = ["- 뉴스를 불러오지 못했습니다."]; continue
+        try:
+            news = dedup_news(parse_rss_items(content, allowed_date), limit)
+            result[sector] = news if news else ["- 관련 뉴스가 없습니다."]
+        except ET.ParseError as e:
+            get_run_stats().record_exception("sector_news.parse_rss_items", e)
+            result[sector] = ["- 뉴스를 불러오지 못했습니다."]
+    return result
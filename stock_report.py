@@ -1,13 +1,16 @@
 import pandas as pd
 import yfinance as yf
-from pykrx import stock
 from datetime import datetime, timedelta
 import os
-import requests
-from bs4 import BeautifulSoup
 import time
-import xml.etree.ElementTree as ET
-import urllib.parse
+import argparse
+from http_fetcher import get_fetcher
+from naver_parse import parse_investor_table
+from ticker_master import get_ticker_master
+from run_stats import get_run_stats, reset_run_stats
+from timeseries_store import TimeSeriesStore
+from sector_news import get_all_sector_news
+from sector_metrics import DEFAULT_PERIODS, FLOW_COLUMNS, compute_sector_metrics, parse_period, period_label, required_since
 
 def get_sector_data():
     """
@@ -37,129 +40,163 @@ def get_sector_data():
     }
 
 def get_ticker_name(ticker):
-    names = {
-        '005930.KS': '삼성전자', '000660.KS': 'SK하이닉스', '373220.KS': 'LG엔솔', '005380.KS': '현대차',
-        '000270.KS': '기아', '207940.KS': '삼성바이오', '068270.KS': '셀트리온', '035420.KS': 'NAVER',
-        '035720.KS': '카카오', '105560.KS': 'KB금융', '055550.KS': '신한지주', '005490.KS': 'POSCO홀딩스',
-        '017670.KS': 'SK텔레콤', '030200.KS': 'KT', '259960.KS': '크래프톤', '352820.KS': '하이브',
-        '051900.KS': 'LG생활건강', '002790.KS': '아모레퍼시픽', '096770.KS': 'SK이노베이션',
-        '010620.KS': '현대중공업', '003490.KS': '대한항공', '011200.KS': 'HMM', '012450.KS': '한화에어로',
-        '000720.KS': '현대건설', '097950.KS': 'CJ제일제당', '023530.KS': '롯데쇼핑'
-    }
-    return names.get(ticker, ticker)
+    return get_ticker_master().name(ticker)
 
-def get_naver_investor_data(ticker_code):
+def get_naver_investor_data(ticker_code, page=1):
     code = ticker_code.split('.')[0]
-    url = f"https://finance.naver.com/item/frgn.naver?code={code}"
-    headers = {'User-Agent': 'Mozilla/5.0'}
+    url = f"https://finance.naver.com/item/frgn.naver?code={code}" + (f"&page={page}" if page > 1 else "")
     try:
-        res = requests.get(url, headers=headers)
-        content = res.content.decode('cp949', 'ignore')
-        soup = BeautifulSoup(content, 'html.parser')
-        tables = soup.find_all('table', class_='type2')
-        target_table = None
-        for t in tables:
-            if '날짜' in t.text:
-                target_table = t; break
-        if not target_table: return None
-        rows = target_table.find_all('tr')
-        data = []
-        for row in rows:
-            cols = row.find_all('td')
-            if len(cols) < 7: continue
-            date_str = cols[0].text.strip().replace('.', '')
-            if not date_str or len(date_str) != 8: continue
-            try:
-                volume = int(cols[4].text.replace(',', ''))
-                inst_net = int(cols[5].text.replace(',', ''))
-                for_net = int(cols[6].text.replace(',', ''))
-                data.append({'날짜': date_str, '거래량': volume, '기관': inst_net, '외국인': for_net, '개인': -(inst_net + for_net)})
-            except: continue
-        return pd.DataFrame(data)
-    except: return None
-
-def get_stats_yf_and_naver(tickers):
-    data = yf.download(tickers, period="60d", interval="1d", progress=False)
-    if data.empty: return None
-    def get_ticker_df(t):
-        if len(tickers) > 1:
-            try: return data.xs(t, axis=1, level=1)
-            except: return pd.DataFrame()
-        return data
-    naver_dfs = {}
+        res = get_fetcher().get(url)
+        table = parse_investor_table(res.content)
+        if table is None: return None
+        return pd.DataFrame({'날짜': table['날짜'], '거래량': table['거래량'], '기관': table['기관'], '외국인': table['외국인'],
+                             '개인': -(table['기관'] + table['외국인'])})
+    except Exception as e:
+        get_run_stats().record_exception("get_naver_investor_data", e); return None
+
+_investor_data_cache = {}
+
+def fetch_investor_data(tickers):
+    """
+    종목별 투자자 수급 데이터를 동시에 수집 (실행 중 한 번 가져온 종목은 재사용)
+    """
+    return get_fetcher().fetch_all(get_naver_investor_data, tickers, cache=_investor_data_cache)
+
+def clear_investor_cache():
+    """
+    fetch_investor_data의 실행 단위 메모이즈를 비웁니다. (상주 모드/벤치마크에서 반복 실행 전 호출)
+    """
+    _investor_data_cache.clear()
+
+def get_naver_investor_history(ticker_code, since, max_pages=30):
+    """
+    수급 페이지를 1페이지부터 과거로 넘기며 since('YYYYMMDD')까지의 수급 데이터를 모읍니다.
+    반환값: (DataFrame 또는 None, 완료 여부) - 완료는 since에 도달했거나 더 과거 페이지가 없는 경우
+    """
+    frames, oldest = [], None
+    for page in range(1, max_pages + 1):
+        df = get_naver_investor_data(ticker_code, page)
+        if df is None: return None, False
+        # 마지막 페이지를 넘기면 같은 페이지가 다시 오므로 더 과거 날짜가 없으면 종료
+        if df.empty or (oldest is not None and df['날짜'].min() >= oldest): break
+        frames.append(df)
+        oldest = df['날짜'].min()
+        if oldest <= since: break
+    else:
+        return (pd.concat(frames) if frames else None), False
+    return (pd.concat(frames) if frames else None), True
+
+FLOW_FIELDS = ['날짜', '거래량', '기관', '외국인', '개인']
+PRICE_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+def update_investor_flows(tickers, store, last_bar=None, since=None):
+    """
+    수급 저장소를 갱신하고 종목별 수급 데이터 전체를 반환합니다.
+    저장된 마지막 날짜가 가격 패널의 마지막 거래일(last_bar, 'YYYYMMDD') 이상이면 네트워크 요청을 생략합니다.
+    (당일 봉은 장중 값이 바뀔 수 있으므로 항상 다시 가져옴)
+    오래된 종목은 마지막 저장일까지 과거 페이지를 넘겨 받으며, 그 사이 구간을 다 받지 못하면 이번 갱신을 건너뜁니다.
+    since('YYYYMMDD')가 주어지면 저장 이력이 그보다 늦게 시작하는 종목은 과거 페이지를 넘겨 보강합니다.
+    (보강한 종목은 최신 페이지까지 함께 받았으므로 다시 요청하지 않음)
+    """
+    today = datetime.now().strftime("%Y%m%d")
+    history = {}
+    if since:
+        short = [t for t in tickers if (store.covered_since(t) or '99999999') > since]
+        get_run_stats().record_cache("flow_history", True, len(tickers) - len(short))
+        get_run_stats().record_cache("flow_history", False, len(short))
+        history = get_fetcher().fetch_all(lambda t: get_naver_investor_history(t, since), short)
+        for t, (df, complete) in history.items():
+            if df is not None and not df.empty: store.replace(t, pd.concat([store.load(t), df[FLOW_FIELDS]]))
+            if complete: store.mark_covered(t, since)
+    stale = [t for t in tickers if t not in history and
+             (last_bar is None or last_bar >= today or (store.last_date(t) or '') < last_bar)]
+    get_run_stats().record_cache("flow_store", True, len(tickers) - len(stale))
+    get_run_stats().record_cache("flow_store", False, len(stale))
+    updates = get_fetcher().fetch_all(lambda t: get_naver_investor_history(t, store.last_date(t) or since or today), stale)
+    for t, (df, complete) in updates.items():
+        # 마지막 저장일까지 닿지 못한 결과를 덧붙이면 중간 구간이 비므로 다음 갱신에서 다시 받음
+        if complete and df is not None and not df.empty: store.append(t, df[FLOW_FIELDS])
+    return {t: store.load(t) for t in tickers}
+
+def flow_coverage(tickers, store):
+    """
+    종목별 수급 이력이 빠짐없이 저장된 시작일 {티커: 'YYYYMMDD' 또는 None} (compute_sector_metrics의 flow_since)
+    """
+    return {t: store.covered_since(t) for t in tickers}
+
+def get_ticker_universe(sectors):
+    """
+    전체 섹터에 포함된 종목의 합집합 (첫 등장 순서 유지, 중복 제거)
+    """
+    return list(dict.fromkeys(t for tickers in sectors.values() for t in tickers))
+
+def download_price_panel(tickers, period="60d", chunk_size=200, start=None):
+    """
+    전체 종목의 OHLCV를 한 번의 배치 다운로드로 가져옵니다. (종목 수가 많으면 chunk 단위)
+    반환값은 (가격항목, 티커) 멀티컬럼 패널이며, 섹터별로는 이 패널의 부분 뷰를 사용합니다.
+    start('YYYY-MM-DD')가 주어지면 period 대신 해당 날짜 이후만 받습니다.
+    """
+    span = {'start': start} if start else {'period': period}
+    frames = []
+    for i in range(0, len(tickers), chunk_size):
+        chunk = tickers[i:i + chunk_size]
+        t0 = time.perf_counter()
+        data = yf.download(chunk, interval="1d", progress=False, group_by="column", **span)
+        get_run_stats().record_request("yfinance", time.perf_counter() - t0, ok=not data.empty)
+        if data.empty: continue
+        if not isinstance(data.columns, pd.MultiIndex):
+            data.columns = pd.MultiIndex.from_product([data.columns, chunk])
+        frames.append(data)
+    if not frames: return None
+    return pd.concat(frames, axis=1).sort_index()
+
+def update_price_panel(tickers, store, since=None):
+    """
+    가격 저장소에 마지막 저장일(당일 포함) 이후 봉만 받아 추가한 뒤, 저장소 전체로 패널을 구성합니다.
+    저장 이력이 없거나 이력 시작일(covered_since)이 since('YYYYMMDD', 기본 90일 전)보다 늦은 종목은 since부터 다시 받습니다.
+    (since부터 받은 종목은 첫 봉이 휴장일/상장일 때문에 늦더라도 다시 받지 않음)
+    요청 시작일이 같은 종목끼리 한 번에 요청합니다.
+    """
+    since = since or (datetime.now() - timedelta(days=90)).strftime("%Y%m%d")
+    groups = {}
     for t in tickers:
-        df = get_naver_investor_data(t); naver_dfs[t] = df
-        time.sleep(0.05)
-    dates_yf = data.index.strftime("%Y%m%d").tolist()
-    def calc_period_metrics(t_list, start_idx, end_idx, base_end_idx):
-        prices, volumes = [], []
-        ind_v_sum, for_v_sum, ins_v_sum = 0, 0, 0
-        up_c, down_c, total_c = 0, 0, 0
-        rep_ticker = t_list[0]
-        rep_metrics = {"가격%": 0, "거래량": 0}
-        start_date_str, end_date_str = dates_yf[start_idx], dates_yf[end_idx]
-        for i, t in enumerate(t_list):
-            tdf = get_ticker_df(t)
-            if tdf.empty: continue
-            try:
-                curr_p, prev_p = tdf['Close'].iloc[end_idx], tdf['Close'].iloc[base_end_idx]
-                p_change = (curr_p - prev_p) / prev_p * 100 if prev_p > 0 else 0
-                if prev_p > 0:
-                    prices.append(p_change); total_c += 1
-                    if p_change > 0: up_c += 1
-                    elif p_change < 0: down_c += 1
-                v_sum = tdf['Volume'].iloc[start_idx:end_idx+1 if end_idx != -1 else None].sum()
-                if not pd.isna(v_sum):
-                    volumes.append(v_sum)
-                    if i == 0: rep_metrics["거래량"] = int(v_sum)
-                if i == 0: rep_metrics["가격%"] = round(p_change, 2)
-                ndf = naver_dfs.get(t)
-                if ndf is not None and not ndf.empty:
-                    mask = (ndf['날짜'] >= start_date_str) & (ndf['날짜'] <= end_date_str)
-                    period_ndf = ndf.loc[mask]
-                    if not period_ndf.empty:
-                        ind_v_sum += period_ndf['개인'].sum(); for_v_sum += period_ndf['외국인'].sum(); ins_v_sum += period_ndf['기관'].sum()
-            except: continue
-        avg_price = sum(prices) / len(prices) if prices else 0
-        sum_vol = sum(volumes) if volumes else 0
-        return {"가격%": round(avg_price, 2), "거래량": int(sum_vol), "개인": int(ind_v_sum), "외인": int(for_v_sum), "기관": int(ins_v_sum), "상승/하락": f"{up_c}/{down_c}", "상승비율%": round((up_c/total_c*100),1) if total_c>0 else 0, "rep_name": get_ticker_name(rep_ticker), "rep_price%": rep_metrics["가격%"], "rep_vol": rep_metrics["거래량"]}
-    res_t = calc_period_metrics(tickers, -1, -1, -2)
-    res_y = calc_period_metrics(tickers, -2, -2, -3)
-    res_w = calc_period_metrics(tickers, -5, -1, -6)
-    return {"당일": res_t, "어제": res_y, "주간": res_w}
-
-def get_sector_news(sector, tickers):
-    company_names = [get_ticker_name(t) for t in tickers[:3]]
-    query = f"({sector}) OR ({' OR '.join(company_names)}) 주식 뉴스"
-    encoded_query = urllib.parse.quote(query)
-    url = f"https://news.google.com/rss/search?q={encoded_query}&hl=ko&gl=KR&ceid=KR:ko"
-    headers = {'User-Agent': 'Mozilla/5.0'}
-    today_dt = datetime.now()
-    allowed_date = today_dt.strftime("%d %b %Y")
-    try:
-        res = requests.get(url, headers=headers, timeout=10)
-        root = ET.fromstring(res.content)
-        raw_news = []
-        for item in root.findall('.//item'):
-            if allowed_date not in item.find('pubDate').text: continue
-            title = item.find('title').text
-            link = item.find('link').text
-            if ' - ' in title: title = title.rsplit(' - ', 1)[0]
-            raw_news.append({'title': title, 'link': link})
-            if len(raw_news) >= 30: break
-        final_filtered, seen_norm = [], []
-        for news in raw_news:
-            curr_norm = "".join(news['title'].split()).lower()
-            duplicate = False
-            for seen in seen_norm:
-                if curr_norm in seen or seen in curr_norm or (len(set(curr_norm).intersection(set(seen))) / max(len(curr_norm), len(seen)) > 0.6):
-                    duplicate = True; break
-            if not duplicate:
-                final_filtered.append(f"- {news['title']} ([링크]({news['link']}))")
-                seen_norm.append(curr_norm)
-                if len(final_filtered) >= 3: break
-        return final_filtered if final_filtered else ["- 관련 뉴스가 없습니다."]
-    except: return ["- 뉴스를 불러오지 못했습니다."]
+        last = store.last_date(t)
+        backfill = last is None or store.covered_since(t) > since
+        groups.setdefault((backfill, since if backfill else last), []).append(t)
+        get_run_stats().record_cache("price_store", not backfill)
+    for (backfill, start), group in groups.items():
+        fresh = download_price_panel(group, start=f"{start[:4]}-{start[4:6]}-{start[6:]}")
+        if fresh is None: continue
+        for t in group:
+            try: tdf = fresh.xs(t, axis=1, level=1)
+            except KeyError as e:
+                get_run_stats().record_exception("update_price_panel.missing_ticker", e); continue
+            tdf = tdf.reindex(columns=PRICE_FIELDS).dropna(how='all')
+            tdf.insert(0, '날짜', tdf.index.strftime("%Y%m%d"))
+            if backfill:
+                store.replace(t, pd.concat([store.load(t), tdf.reset_index(drop=True)]))
+                store.mark_covered(t, since)
+            else: store.append(t, tdf)
+    return load_price_panel(tickers, store)
+
+def load_price_panel(tickers, store):
+    """
+    저장소의 종목별 OHLCV를 (가격항목, 티커) 멀티컬럼 패널로 합칩니다.
+    """
+    frames = {}
+    for t in tickers:
+        df = store.load(t)
+        if df.empty: continue
+        frames[t] = df.set_index(pd.to_datetime(df['날짜'], format="%Y%m%d").rename('Date'))[PRICE_FIELDS]
+    if not frames: return None
+    return pd.concat(frames, axis=1).swaplevel(axis=1).sort_index()
+
+def get_stats_yf_and_naver(tickers, panel=None, naver_dfs=None, periods=None):
+    if panel is None: panel = download_price_panel(tickers)
+    if panel is None: return None
+    if naver_dfs is None: naver_dfs = fetch_investor_data(tickers)
+    metrics = compute_sector_metrics(panel, naver_dfs, {"_": tickers}, periods, name_of=get_ticker_name)
+    return metrics.get("_")
 
 def generate_summary(df, sector_news):
     summary = "## 📝 시장 분석 요약\n\n"
@@ -180,46 +217,122 @@ def generate_summary(df, sector_news):
     summary += "\n---"
     return summary
 
-def main():
-    print(f"한국 증시 섹터별 종합 리포트 ({datetime.now().strftime('%Y-%m-%d %H:%M')})")
-    sectors = get_sector_data(); results, sector_news_dict = [], {}
-    for sector, tickers in sectors.items():
-        print(f"분석 중: {sector}...")
-        metrics = get_stats_yf_and_naver(tickers)
+def build_periods(extra=None):
+    """
+    기본 기간(당일/어제/주간)에 추가 기간 spec 목록을 더한 {기간명: spec}
+    """
+    periods = dict(DEFAULT_PERIODS)
+    for spec in extra or []:
+        periods[period_label(spec)] = spec
+    return periods
+
+def period_list(text):
+    """
+    argparse용 쉼표 구분 기간 목록 -> 기간 spec 리스트
+    """
+    try:
+        return [parse_period(p) for p in text.split(',') if p.strip()]
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"잘못된 기간: {text} ({e})")
+
+def missing_periods(df, periods):
+    """
+    가격 이력이 부족해(주말만 포함된 구간, 저장 이력 이전 구간 등) 리포트 표에 없는 기간명 목록
+    """
+    return [p for p in periods if f"{p}_가격%" not in df.columns]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="한국 증시 섹터별 종합 리포트")
+    parser.add_argument('--periods', type=period_list, default="", help="추가 기간 (쉼표 구분): 20d,60d,YTD,20250101:20250131")
+    return parser.parse_args()
+
+def build_report_table(all_metrics, sectors):
+    """
+    섹터별 지표를 '기간_지표' 컬럼의 한 행으로 펼친 DataFrame
+    """
+    results = []
+    for sector in sectors:
+        metrics = all_metrics.get(sector)
         if not metrics: continue
-        sector_news_dict[sector] = get_sector_news(sector, tickers)
-        res = {"섹터": sector, "당일_가격%": metrics["당일"]["가격%"], "당일_거래량": metrics["당일"]["거래량"], "당일_외인": metrics["당일"]["외인"], "당일_기관": metrics["당일"]["기관"], "당일_개인": metrics["당일"]["개인"], "당일_상승/하락": metrics["당일"]["상승/하락"], "당일_상승비율%": metrics["당일"]["상승비율%"], "당일_rep_price%": metrics["당일"]["rep_price%"], "당일_rep_vol": metrics["당일"]["rep_vol"], "어제_가격%": metrics["어제"]["가격%"], "어제_거래량": metrics["어제"]["거래량"], "어제_외인": metrics["어제"]["외인"], "어제_기관": metrics["어제"]["기관"], "어제_개인": metrics["어제"]["개인"], "어제_상승/하락": metrics["어제"]["상승/하락"], "어제_상승비율%": metrics["어제"]["상승비율%"], "어제_rep_price%": metrics["어제"]["rep_price%"], "어제_rep_vol": metrics["어제"]["rep_vol"], "주간_가격%": metrics["주간"]["가격%"], "주간_거래량": metrics["주간"]["거래량"], "주간_외인": metrics["주간"]["외인"], "주간_기관": metrics["주간"]["기관"], "주간_개인": metrics["주간"]["개인"], "주간_상승/하락": metrics["주간"]["상승/하락"], "주간_상승비율%": metrics["주간"]["상승비율%"], "주간_rep_price%": metrics["주간"]["rep_price%"], "주간_rep_vol": metrics["주간"]["rep_vol"], "rep_name": metrics["당일"]["rep_name"]}
+        res = {"섹터": sector, "rep_name": next(iter(metrics.values()))["rep_name"]}
+        for period, m in metrics.items():
+            res.update({f"{period}_{k}": v for k, v in m.items() if k != "rep_name"})
         results.append(res)
-    if not results: return
-    df = pd.DataFrame(results).fillna(0)
+    if not results: return None
+    df = pd.DataFrame(results)
+    # 수급 이력이 부족한 기간의 개인/외인/기관은 NaN으로 남겨 리포트에 '-'로 표시
+    flow_cols = [c for c in df.columns if c.rsplit('_', 1)[-1] in FLOW_COLUMNS]
+    return df.fillna({c: 0 for c in df.columns if c not in flow_cols})
+
+def render_report(df, sector_news_dict, sectors, periods, today_str):
+    """
+    마크다운 리포트 본문 생성
+    """
     analysis_summary = generate_summary(df, sector_news_dict)
+    out = [f"# 한국 증시 섹터별 종합 리포트 ({today_str})\n\n" + analysis_summary + "\n\n## 📊 섹터별 세부 지표\n- 가격% : 섹터 내 종목들의 평균 가격 변동률\n- 거래량 : 해당 기간 섹터 내 종목들의 총 거래량 (주)\n- 외인/기관/개인 : 해당 기간 섹터 내 종목들의 순매수 수량 합계 (주, 수급 데이터가 없는 종목은 제외, '-'는 수급 이력이 기간 시작일 이후부터만 있는 종목이 포함된 경우)\n- 상승/하락 : 섹터 내 상승 종목 수 / 하락 종목 수\n- 상승비율% : 섹터 내 전체 종목 중 상승한 종목의 비중\n\n"]
+    missing = missing_periods(df, periods)
+    for period in periods:
+        out.append(f"### {period} 리포트\n\n")
+        if period in missing:
+            out.append("데이터 부족: 해당 기간의 거래일이 가격 이력에 없습니다.\n\n"); continue
+        display_cols = ["섹터", f"{period}_가격%", f"{period}_상승/하락", f"{period}_상승비율%", f"{period}_거래량", f"{period}_외인", f"{period}_기관", f"{period}_개인"]
+        sub_df = df[display_cols].copy(); sub_df.columns = [c.replace(f"{period}_", "") for c in sub_df.columns]
+        sub_df = sub_df.sort_values(by=["가격%", "거래량"], ascending=False)
+        for c in sub_df.columns:
+            if (sub_df[c].dtype in ['int64', 'float64'] or c in FLOW_COLUMNS) and c not in ['가격%', '상승비율%']: sub_df[c] = sub_df[c].apply(lambda x: f"{int(x):,}" if pd.notna(x) else "-")
+        out.append(sub_df.to_markdown(index=False) + "\n\n")
+        
+        # 섹터별 포함 종목 리스트 추가
+        out.append("<details><summary>🔎 섹터별 포함 종목 보기</summary>\n\n")
+        for sector in sub_df["섹터"]:
+            tickers = sectors.get(sector, [])
+            names = [get_ticker_name(t) for t in tickers]
+            out.append(f"- **{sector}**: {', '.join(names)}\n")
+        out.append("\n</details>\n\n")
+
+    out.append("## 🔍 섹터별 주요 뉴스 전체 보기\n\n")
+    for sector, news in sector_news_dict.items():
+        out.append(f"### {sector}\n" + "\n".join(news) + "\n\n")
+    out.append("*이 리포트는 자동 생성되었습니다.*")
+    return "".join(out)
+
+def main(args=None):
+    args = args or parse_args()
+    stats = reset_run_stats("stock_report")
+    periods = build_periods(args.periods)
+    print(f"한국 증시 섹터별 종합 리포트 ({datetime.now().strftime('%Y-%m-%d %H:%M')})")
+    sectors = get_sector_data()
+    universe = get_ticker_universe(sectors)
+    with stats.stage("ticker_master"):
+        get_ticker_master()
+    price_store, flow_store = TimeSeriesStore("prices"), TimeSeriesStore("flows")
+    print(f"가격 데이터 갱신 중: 전체 {len(universe)}개 종목...")
+    with stats.stage("prices"):
+        panel = update_price_panel(universe, price_store, since=required_since(periods))
+    if panel is None: return
+    print(f"수급 데이터 갱신 중: 전체 {len(universe)}개 종목...")
+    with stats.stage("investor_flows"):
+        naver_dfs = update_investor_flows(universe, flow_store, panel.index[-1].strftime("%Y%m%d"), since=required_since(periods))
+    print(f"섹터 지표 계산 중: {len(sectors)}개 섹터...")
+    with stats.stage("metrics"):
+        all_metrics = compute_sector_metrics(panel, naver_dfs, sectors, periods, name_of=get_ticker_name,
+                                             flow_since=flow_coverage(universe, flow_store))
+        df = build_report_table(all_metrics, sectors)
+    if df is None: return
+    missing = missing_periods(df, periods)
+    if missing: print(f"[경고] 데이터 부족으로 계산하지 못한 기간: {', '.join(missing)}")
+    print(f"뉴스 수집 중: {len(df)}개 섹터...")
+    with stats.stage("news"):
+        sector_news_dict = get_all_sector_news({s: sectors[s] for s in df["섹터"]}, name_of=get_ticker_name)
     today_str = datetime.now().strftime('%Y-%m-%d')
     filename = f"reports/report_{today_str}.md"
     os.makedirs("reports", exist_ok=True)
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(f"# 한국 증시 섹터별 종합 리포트 ({today_str})\n\n" + analysis_summary + "\n\n## 📊 섹터별 세부 지표\n- 가격% : 섹터 내 종목들의 평균 가격 변동률\n- 거래량 : 해당 기간 섹터 내 종목들의 총 거래량 (주)\n- 외인/기관/개인 : 해당 기간 섹터 내 종목들의 순매수 수량 합계 (주)\n- 상승/하락 : 섹터 내 상승 종목 수 / 하락 종목 수\n- 상승비율% : 섹터 내 전체 종목 중 상승한 종목의 비중\n\n")
-        for period in ["당일", "어제", "주간"]:
-            f.write(f"### {period} 리포트\n\n")
-            display_cols = ["섹터", f"{period}_가격%", f"{period}_상승/하락", f"{period}_상승비율%", f"{period}_거래량", f"{period}_외인", f"{period}_기관", f"{period}_개인"]
-            sub_df = df[display_cols].copy(); sub_df.columns = [c.replace(f"{period}_", "") for c in sub_df.columns]
-            sub_df = sub_df.sort_values(by=["가격%", "거래량"], ascending=False)
-            for c in sub_df.columns:
-                if sub_df[c].dtype in ['int64', 'float64'] and c not in ['가격%', '상승비율%']: sub_df[c] = sub_df[c].apply(lambda x: f"{int(x):,}")
-            f.write(sub_df.to_markdown(index=False) + "\n\n")
-            
-            # 섹터별 포함 종목 리스트 추가
-            f.write("<details><summary>🔎 섹터별 포함 종목 보기</summary>\n\n")
-            for sector in sub_df["섹터"]:
-                tickers = get_sector_data().get(sector, [])
-                names = [get_ticker_name(t) for t in tickers]
-                f.write(f"- **{sector}**: {', '.join(names)}\n")
-            f.write("\n</details>\n\n")
-
-        f.write("## 🔍 섹터별 주요 뉴스 전체 보기\n\n")
-        for sector, news in sector_news_dict.items():
-            f.write(f"### {sector}\n" + "\n".join(news) + "\n\n")
-        f.write("*이 리포트는 자동 생성되었습니다.*")
-    print(f"\n[알림] 마크다운 리포트가 생성되었습니다: {filename}")
+    with stats.stage("render"):
+        content = render_report(df, sector_news_dict, sectors, periods, today_str)
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(content)
+    summary_file = stats.write_json(filename.replace(".md", ".run.json"))
+    print(f"\n[알림] 마크다운 리포트가 생성되었습니다: {filename} (실행 요약: {summary_file})")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from screener_engine import SCREENS, ScreenerEngine
+
+def engine_with(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.Index([f"{i:06d}" for i in range(n)], name="티커")
+    universe = pd.DataFrame({"종목명": [f"종목{i}" for i in range(n)], "시장": "KOSPI", "업종": None,
+                             "상장주식수": 1e7, "시가총액(억)": rng.uniform(100, 10_000, n)}, index=index)
+    engine = ScreenerEngine(universe)
+    items = {}
+    for i, t in enumerate(index):
+        op = float(rng.uniform(-50, 500))
+        items[t] = {"Q": {"영업이익": [("q", op / 4)] * 4, "당기순이익": [("q", op / 5)] * 4, "매출액": [("q", op * 2)] * 4},
+                    "Y": {"BPS": [("y", 10_000.0)], "부채비율": [("y", 80.0)]} if i % 7 else {}}
+    engine.fill_fundamentals(items)
+    return engine
+
+@pytest.mark.parametrize("name", list(SCREENS))
+@pytest.mark.parametrize("top", [1, 5, 50, 1000])
+def test_screen_matches_full_sort(name, top):
+    engine, spec = engine_with(), SCREENS[name]
+    t = engine.table
+    mask = t[spec["sort_by"]].notna()
+    for col, op, value in spec["filters"]:
+        mask &= {">": t[col] > value, ">=": t[col] >= value}[op]
+    expected = t[mask].sort_values(spec["sort_by"], kind="stable").head(top)
+    result = engine.screen(spec, top)
+    # 반올림된 지표의 동률 종목은 부분 정렬 순서가 달라질 수 있으므로 정렬 키 값으로 비교
+    assert result[spec["sort_by"]].tolist() == expected[spec["sort_by"]].tolist()
+    assert set(result["티커"]) <= set(t[mask].index)
+
+def test_screen_rejects_top_below_one():
+    with pytest.raises(ValueError):
+        engine_with().screen(SCREENS["저PBR"], 0)
+
+def test_ev_ebit_is_nan_without_debt():
+    t = engine_with().table
+    no_debt = t["부채비율%"].isna()
+    assert no_debt.any()
+    assert t.loc[no_debt, "EV/EBIT"].isna().all()
+    assert t.loc[~no_debt & (t["4분기영업이익(억)"] > 0), "EV/EBIT"].notna().all()
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sector_metrics import DEFAULT_PERIODS, compute_sector_metrics, parse_period, resolve_period
+
+def baseline_period_metrics(panel, naver_dfs, tickers, start_idx, end_idx, base_end_idx):
+    """
+    벡터화 이전 stock_report.calc_period_metrics 루프 (비교 기준)
+    """
+    dates = panel.index.strftime("%Y%m%d").tolist()
+    prices, volumes = [], []
+    ind_v_sum, for_v_sum, ins_v_sum = 0, 0, 0
+    up_c, down_c, total_c = 0, 0, 0
+    rep_metrics = {"가격%": 0, "거래량": 0}
+    start_date_str, end_date_str = dates[start_idx], dates[end_idx]
+    for i, t in enumerate(tickers):
+        tdf = panel.xs(t, axis=1, level=1)
+        curr_p, prev_p = tdf['Close'].iloc[end_idx], tdf['Close'].iloc[base_end_idx]
+        p_change = (curr_p - prev_p) / prev_p * 100 if prev_p > 0 else 0
+        if prev_p > 0:
+            prices.append(p_change); total_c += 1
+            if p_change > 0: up_c += 1
+            elif p_change < 0: down_c += 1
+        v_sum = tdf['Volume'].iloc[start_idx:end_idx + 1 if end_idx != -1 else None].sum()
+        if not pd.isna(v_sum):
+            volumes.append(v_sum)
+            if i == 0: rep_metrics["거래량"] = int(v_sum)
+        if i == 0: rep_metrics["가격%"] = round(p_change, 2)
+        ndf = naver_dfs.get(t)
+        if ndf is not None and not ndf.empty:
+            period_ndf = ndf[(ndf['날짜'] >= start_date_str) & (ndf['날짜'] <= end_date_str)]
+            ind_v_sum += period_ndf['개인'].sum(); for_v_sum += period_ndf['외국인'].sum(); ins_v_sum += period_ndf['기관'].sum()
+    avg_price = sum(prices) / len(prices) if prices else 0
+    return {"가격%": round(avg_price, 2), "거래량": int(sum(volumes)), "개인": int(ind_v_sum), "외인": int(for_v_sum),
+            "기관": int(ins_v_sum), "상승/하락": f"{up_c}/{down_c}", "상승비율%": round(up_c / total_c * 100, 1) if total_c else 0,
+            "rep_name": tickers[0], "rep_price%": rep_metrics["가격%"], "rep_vol": rep_metrics["거래량"]}
+
+def synthetic_market(n_days=40, seed=0):
+    rng = np.random.default_rng(seed)
+    tickers = ["A", "B", "C", "D", "E"]
+    index = pd.bdate_range("2026-03-02", periods=n_days)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.02, (n_days, len(tickers))), axis=0)
+    close[5, 2] = np.nan  # 중간 결측 (마지막 종가는 결측 없음)
+    volume = rng.integers(1_000, 50_000, (n_days, len(tickers))).astype(float)
+    volume[-3, 1] = np.nan
+    panel = pd.concat({"Close": pd.DataFrame(close, index=index, columns=tickers),
+                       "Volume": pd.DataFrame(volume, index=index, columns=tickers)}, axis=1)
+    dates = index.strftime("%Y%m%d")
+    naver_dfs = {t: pd.DataFrame({"날짜": dates, "거래량": volume[:, j], "기관": rng.integers(-500, 500, n_days),
+                                  "외국인": rng.integers(-500, 500, n_days), "개인": rng.integers(-500, 500, n_days)})
+                 for j, t in enumerate(tickers)}
+    naver_dfs["D"] = None  # 수급 수집 실패 종목
+    return panel, naver_dfs
+
+def test_matches_baseline_loop():
+    panel, naver_dfs = synthetic_market()
+    sectors = {"s1": ["A", "B", "C"], "s2": ["D", "E", "A"], "s3": ["B", "B", "E"]}
+    result = compute_sector_metrics(panel, naver_dfs, sectors)
+    for sector, tickers in sectors.items():
+        for name, (start, end, base) in DEFAULT_PERIODS.items():
+            assert result[sector][name] == baseline_period_metrics(panel, naver_dfs, tickers, start, end, base), (sector, name)
+
+def test_flow_window_flagged_only_when_coverage_starts_late():
+    panel, naver_dfs = synthetic_market()
+    naver_dfs["B"] = naver_dfs["B"].iloc[-10:]
+    sectors = {"s": ["A", "B"]}
+    periods = {"당일": (-1, -1, -2), "20d": "20d"}
+    result = compute_sector_metrics(panel, naver_dfs, sectors, periods)
+    assert result["s"]["당일"]["외인"] is not None
+    assert result["s"]["20d"]["외인"] is None
+    # 저장소 기준으로 이력이 빠짐없이 받아진 종목(신규 상장 등)은 표시하지 않음
+    covered = {"A": "20260302", "B": "20260302"}
+    result = compute_sector_metrics(panel, naver_dfs, sectors, periods, flow_since=covered)
+    assert result["s"]["20d"]["외인"] is not None
+
+def test_resolve_period():
+    dates = np.array(pd.bdate_range("2025-12-22", "2026-01-16").strftime("%Y%m%d"))
+    n = len(dates)
+    assert resolve_period("5d", dates) == (n - 5, n - 1, n - 6)
+    assert resolve_period(f"{n}d", dates) is None
+    start = int(np.flatnonzero(dates == "20260101")[0])
+    assert resolve_period("YTD", dates) == (start, n - 1, start - 1)
+    assert resolve_period(("20260105", "20260109"), dates) == (10, 14, 9)
+    assert resolve_period(("20260110", "20260111"), dates) is None  # 주말만 포함된 구간
+    assert resolve_period(("20250101", "20250131"), dates) is None  # 저장 이력 이전 구간
+    assert resolve_period((-1, -1, -2), dates) == (n - 1, n - 1, n - 2)
+
+@pytest.mark.parametrize("text, spec", [("20d", "20d"), ("ytd", "YTD"), ("20250101:20250131", ("20250101", "20250131"))])
+def test_parse_period(text, spec):
+    assert parse_period(text) == spec
+
+@pytest.mark.parametrize("text", ["0d", "20x", "2025:20250131"])
+def test_parse_period_rejects_invalid(text):
+    with pytest.raises(ValueError):
+        parse_period(text)
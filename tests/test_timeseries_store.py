@@ -0,0 +1,43 @@
+import pandas as pd
+
+from timeseries_store import TimeSeriesStore
+
+def bars(dates, close):
+    return pd.DataFrame({"날짜": dates, "Close": close})
+
+def raw_dates(store, ticker):
+    return pd.read_csv(store.path(ticker), dtype={"날짜": str})["날짜"].tolist()
+
+def test_append_keeps_only_rows_from_last_date(tmp_path):
+    store = TimeSeriesStore("prices", root=str(tmp_path))
+    assert store.append("A", bars(["20260302", "20260303"], [1.0, 2.0])) == 2
+    # 마지막 저장일 이전 행은 무시하고 이후 행만 추가
+    assert store.append("A", bars(["20260302", "20260303", "20260304"], [9.0, 2.0, 3.0])) == 1
+    assert raw_dates(store, "A") == ["20260302", "20260303", "20260304"]
+    assert store.load("A")["Close"].tolist() == [1.0, 2.0, 3.0]
+    assert store.date_range("A") == ("20260302", "20260304")
+
+def test_append_unchanged_last_bar_is_noop(tmp_path):
+    store = TimeSeriesStore("prices", root=str(tmp_path))
+    store.append("A", bars(["20260302", "20260303"], [1.0, 2.0]))
+    assert store.append("A", bars(["20260303"], [2.0])) == 0
+    assert raw_dates(store, "A") == ["20260302", "20260303"]
+
+def test_rewritten_last_bar_is_compacted(tmp_path):
+    store = TimeSeriesStore("prices", root=str(tmp_path))
+    store.append("A", bars(["20260302", "20260303"], [1.0, 2.0]))
+    for i in range(10):  # 장중 반복 갱신
+        store.append("A", bars(["20260303"], [2.0 + i + 1]))
+    assert raw_dates(store, "A") == ["20260302", "20260303"]
+    assert store.load("A")["Close"].tolist() == [1.0, 12.0]
+    store.append("A", bars(["20260303", "20260304"], [13.0, 14.0]))
+    assert raw_dates(store, "A") == ["20260302", "20260303", "20260304"]
+    assert store.load("A")["Close"].tolist() == [1.0, 13.0, 14.0]
+
+def test_covered_since_uses_recorded_start(tmp_path):
+    store = TimeSeriesStore("flows", root=str(tmp_path))
+    assert store.covered_since("A") is None
+    store.replace("A", bars(["20260305", "20260306"], [1.0, 2.0]))
+    assert store.covered_since("A") == "20260305"
+    store.mark_covered("A", "20260101")
+    assert store.covered_since("A") == "20260101"
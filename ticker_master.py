@@ -0,0 +1,91 @@
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from run_stats import get_run_stats
+
+DEFAULT_PATH = os.path.join("cache", "ticker_master.csv")
+COLUMNS = ['티커', '종목명', '시장', '업종', '상장주식수', '시가총액']
+MARKETS = {"KOSPI": ".KS", "KOSDAQ": ".KQ"}
+
+# 리포트에 사용하는 약칭 (정식 종목명보다 우선)
+DISPLAY_NAMES = {
+    '005930': '삼성전자', '000660': 'SK하이닉스', '373220': 'LG엔솔', '005380': '현대차',
+    '000270': '기아', '207940': '삼성바이오', '068270': '셀트리온', '035420': 'NAVER',
+    '035720': '카카오', '105560': 'KB금융', '055550': '신한지주', '005490': 'POSCO홀딩스',
+    '017670': 'SK텔레콤', '030200': 'KT', '259960': '크래프톤', '352820': '하이브',
+    '051900': 'LG생활건강', '002790': '아모레퍼시픽', '096770': 'SK이노베이션',
+    '010620': '현대중공업', '003490': '대한항공', '011200': 'HMM', '012450': '한화에어로',
+    '000720': '현대건설', '097950': 'CJ제일제당', '023530': '롯데쇼핑'
+}
+
+def to_code(ticker):
+    """
+    '005930.KS' / '005930' -> '005930'
+    """
+    return str(ticker).split('.')[0].zfill(6)
+
+def fetch_listing(date=None):
+    """
+    pykrx로 KOSPI/KOSDAQ 전 종목의 종목명, 업종, 상장주식수, 시가총액을 한 번에 가져옵니다.
+    """
+    from pykrx import stock
+    date = date or stock.get_nearest_business_day_in_a_week()
+    frames = []
+    for market in MARKETS:
+        cls = stock.get_market_sector_classifications(date, market)
+        cap = stock.get_market_cap(date, market=market)
+        df = cls[['종목명', '업종명']].join(cap[['상장주식수', '시가총액']], how='left')
+        df = df.rename(columns={'업종명': '업종'}).rename_axis('티커').reset_index()
+        df['시장'] = market
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)[COLUMNS]
+
+class TickerMaster:
+    """
+    종목코드 -> 종목명/시장/업종/상장주식수 메모리 색인
+    - 로컬 파일(cache/ticker_master.csv)에서 읽고, 없거나 오래되었으면 pykrx로 일괄 갱신
+    """
+    def __init__(self, df):
+        self.df = df.assign(티커=df['티커'].map(to_code)).drop_duplicates('티커').set_index('티커')
+        self._names = self.df['종목명'].to_dict()
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH, max_age_days=7, refresh=False):
+        stale = refresh or not os.path.exists(path) or datetime.now() - datetime.fromtimestamp(os.path.getmtime(path)) > timedelta(days=max_age_days)
+        if stale:
+            try:
+                df = fetch_listing()
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                df.to_csv(path, index=False)
+                return cls(df)
+            except Exception as e:
+                get_run_stats().record_exception("ticker_master.fetch_listing", e)
+                print(f"[경고] 종목 마스터 갱신 실패: {e}")
+        if os.path.exists(path):
+            return cls(pd.read_csv(path, dtype={'티커': str}))
+        return cls(pd.DataFrame(columns=COLUMNS))
+
+    def name(self, ticker):
+        code = to_code(ticker)
+        return DISPLAY_NAMES.get(code) or self._names.get(code) or ticker
+
+_master = None
+
+def get_ticker_master():
+    """
+    프로세스 전역에서 한 번만 로드하는 종목 마스터
+    """
+    global _master
+    if _master is None:
+        _master = TickerMaster.load()
+    return _master
+
+def reload_ticker_master(refresh=False):
+    """
+    종목 마스터를 다시 로드합니다. (상주 서비스에서 주기적으로 호출, 파일이 오래되었으면 pykrx로 갱신)
+    """
+    global _master
+    _master = TickerMaster.load(refresh=refresh)
+    return _master
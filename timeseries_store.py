@@ -0,0 +1,130 @@
+import json
+import os
+import threading
+
+import pandas as pd
+
+DEFAULT_ROOT = os.path.join("cache", "timeseries")
+
+class TimeSeriesStore:
+    """
+    종목별 일별 시계열을 CSV 파일에 저장하는 로컬 저장소
+    - 새 날짜는 파일 끝에 추가만 하고, 마지막 날짜(장중 미완성 봉)가 바뀌어 들어오면 파일을 다시 써서 그 행을 교체
+      (같은 날짜 행이 쌓이지 않도록 하며, 읽을 때도 중복 날짜는 마지막 행을 사용)
+    - date_col: 날짜 컬럼명, 값은 'YYYYMMDD' 문자열로 저장
+    - 과거 구간을 받아둔 요청 시작일을 종목별로 기록 (_coverage.json)
+      (휴장일/신규 상장으로 첫 저장일이 요청 시작일보다 늦어도 다시 받지 않기 위함)
+    """
+    def __init__(self, name, root=DEFAULT_ROOT, date_col='날짜'):
+        self.dir = os.path.join(root, name)
+        self.date_col = date_col
+        self._locks = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.dir, exist_ok=True)
+
+    def _coverage_path(self):
+        return os.path.join(self.dir, "_coverage.json")
+
+    def _read_coverage(self):
+        path = self._coverage_path()
+        if not os.path.exists(path): return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def covered_since(self, ticker):
+        """
+        빠짐없이 저장된 구간의 시작일 ('YYYYMMDD'): 기록된 요청 시작일과 첫 저장 날짜 중 이른 날짜, 없으면 None
+        """
+        first, _ = self.date_range(ticker)
+        with self._lock:
+            recorded = self._read_coverage().get(ticker)
+        return min(d for d in (first, recorded) if d) if (first or recorded) else None
+
+    def mark_covered(self, ticker, since):
+        """
+        since('YYYYMMDD') 이후 이력을 모두 받았다고 기록합니다.
+        """
+        with self._lock:
+            coverage = self._read_coverage()
+            if coverage.get(ticker, "99999999") <= since: return
+            coverage[ticker] = since
+            tmp = self._coverage_path() + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(coverage, f)
+            os.replace(tmp, self._coverage_path())
+
+    def path(self, ticker):
+        return os.path.join(self.dir, f"{ticker}.csv")
+
+    def _ticker_lock(self, ticker):
+        with self._lock:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def load(self, ticker):
+        """
+        저장된 시계열 전체 (날짜 오름차순, 중복 날짜는 마지막 값 사용). 없으면 빈 DataFrame
+        """
+        path = self.path(ticker)
+        if not os.path.exists(path): return pd.DataFrame()
+        with self._ticker_lock(ticker):
+            df = pd.read_csv(path, dtype={self.date_col: str})
+        df = df.drop_duplicates(subset=self.date_col, keep='last')
+        return df.sort_values(self.date_col).reset_index(drop=True)
+
+    def last_date(self, ticker):
+        """
+        마지막 저장 날짜 ('YYYYMMDD'), 없으면 None
+        """
+        path = self.path(ticker)
+        if not os.path.exists(path): return None
+        with self._ticker_lock(ticker):
+            dates = pd.read_csv(path, usecols=[self.date_col], dtype={self.date_col: str})[self.date_col]
+        return dates.max() if not dates.empty else None
+
+    def date_range(self, ticker):
+        """
+        (첫 저장 날짜, 마지막 저장 날짜), 없으면 (None, None)
+        """
+        path = self.path(ticker)
+        if not os.path.exists(path): return None, None
+        with self._ticker_lock(ticker):
+            dates = pd.read_csv(path, usecols=[self.date_col], dtype={self.date_col: str})[self.date_col]
+        return (dates.min(), dates.max()) if not dates.empty else (None, None)
+
+    def replace(self, ticker, df):
+        """
+        저장된 시계열을 df로 통째로 교체합니다. (저장 시작일 이전 과거 구간을 보강할 때만 사용)
+        """
+        path = self.path(ticker)
+        df = df.drop_duplicates(subset=self.date_col, keep='last').sort_values(self.date_col)
+        with self._ticker_lock(ticker):
+            df.to_csv(path, index=False)
+        return len(df)
+
+    def append(self, ticker, df):
+        """
+        마지막 저장 날짜 이후(당일 포함) 행만 저장합니다. 추가/교체한 행 수를 반환합니다.
+        마지막 저장 날짜의 값이 바뀐 경우에는 파일 전체를 다시 써서 중복 행을 정리합니다.
+        """
+        if df is None or df.empty: return 0
+        stored = self.load(ticker)
+        if not stored.empty:
+            last_row = stored.iloc[-1]
+            last = last_row[self.date_col]
+            df = df[df[self.date_col] >= last]
+            # 마지막 저장 행과 값이 같으면 다시 쓰지 않음
+            value_cols = [c for c in stored.columns if c != self.date_col]
+            new_vals = df[value_cols].apply(pd.to_numeric, errors='coerce').round(6)
+            last_vals = pd.to_numeric(last_row[value_cols], errors='coerce').round(6)
+            same = (df[self.date_col] == last) & (new_vals == last_vals).all(axis=1)
+            df = df[~same]
+        if df.empty: return 0
+        path = self.path(ticker)
+        if not stored.empty and (df[self.date_col] == last).any():
+            merged = pd.concat([stored, df]).drop_duplicates(subset=self.date_col, keep='last')
+            with self._ticker_lock(ticker):
+                merged.to_csv(path, index=False)
+            return len(df)
+        with self._ticker_lock(ticker):
+            df.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+        return len(df)